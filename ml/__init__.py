@@ -0,0 +1 @@
+"""Nova Titan ML service package"""
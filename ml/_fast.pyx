@@ -0,0 +1,28 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Nova Titan compiled numeric kernels
+
+AOT-compiled with Cython (python setup.py build_ext --inplace) so the
+hot prediction path gets native code without Numba's JIT warmup cost.
+utils/fastmath.py provides NumPy fallbacks when the extension is not
+built.
+"""
+
+from libc.math cimport exp
+
+import numpy as np
+
+
+cpdef double sigmoid_scalar(double x):
+    """Logistic sigmoid of a single value"""
+    return 1.0 / (1.0 + exp(-x))
+
+
+cpdef sigmoid(double[:] x):
+    """Elementwise logistic sigmoid over a float64 vector"""
+    cdef Py_ssize_t i, n = x.shape[0]
+    out_arr = np.empty(n, dtype=np.float64)
+    cdef double[:] out = out_arr
+    for i in range(n):
+        out[i] = 1.0 / (1.0 + exp(-x[i]))
+    return out_arr
@@ -0,0 +1,23 @@
+"""
+Gunicorn configuration for the Nova Titan ML Service
+
+Run with: gunicorn -c ml/gunicorn_conf.py ml.main:app
+
+preload_app imports the application once in the parent process before
+forking, so with PRELOAD_MODEL=true the LightGBM booster's arrays live
+in copy-on-write pages shared by all workers instead of one private
+copy per worker. Redis connections are still created per worker in
+lifespan (sockets can't be shared across fork).
+"""
+
+import os
+
+bind = "0.0.0.0:3002"
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Used by lifespan for per-worker concerns (e.g. CPU affinity)
+    os.environ["APP_WORKER_ID"] = str(worker.age)
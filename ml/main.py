@@ -4,44 +4,145 @@ AI-powered sports prediction engine
 """
 
 import os
+import sys
 import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+import xxhash
+from pydantic import BaseModel, Field, ValidationError
+from typing import Annotated, List, Dict, Any, Optional
 import uvicorn
 from loguru import logger
 
 # Import our ML modules
-from models.prediction_engine import PredictionEngine
-from models.feature_builder import FeatureBuilder  
-from models.model_trainer import ModelTrainer
-from utils.cache import CacheManager
-from utils.config import get_settings
-from schemas.prediction_schemas import (
-    PredictionRequest, 
+from .models.prediction_engine import PredictionEngine, retrain_models
+from .models.feature_builder import FeatureBuilder
+from .models.model_trainer import ModelTrainer
+from .utils.cache import CacheManager
+from .utils.coalescer import BatchCoalescer
+from .utils.config import get_settings
+from .schemas.prediction_schemas import (
+    PredictionRequest,
     PredictionResponse,
     BatchPredictionRequest,
     BatchPredictionResponse,
+    _BATCH_REQ_ADAPTER,
     ModelPerformanceResponse,
-    HealthResponse
+    HealthResponse,
+    ModelFeatures,
+    PredictionType
 )
 
 # Global variables
 prediction_engine: Optional[PredictionEngine] = None
 cache_manager: Optional[CacheManager] = None
+batch_coalescer: Optional[BatchCoalescer] = None
+retrain_executor: Optional[ProcessPoolExecutor] = None
+
+# Health state refreshed by a background probe so /health is a dict read
+# with deterministic latency, independent of probe RPS and Redis state
+_HEALTH = {"prediction_engine": "down", "cache": "down"}
+_HEALTH_PROBE_INTERVAL = 2.0
+_health_task: Optional[asyncio.Task] = None
+
+async def _refresh_health_loop():
+    while True:
+        try:
+            _HEALTH["prediction_engine"] = (
+                "up" if prediction_engine and prediction_engine.is_healthy() else "down"
+            )
+            _HEALTH["cache"] = (
+                "up" if cache_manager and await cache_manager.is_healthy() else "down"
+            )
+        except Exception as e:
+            logger.warning(f"Health probe failed: {e}")
+        await asyncio.sleep(_HEALTH_PROBE_INTERVAL)
+
+# In-process cache for model metadata endpoints. Feature info and
+# performance metrics only change on retrain, so repeat calls are served
+# from a dict lookup; entries expire after a short TTL and the cache is
+# cleared when retraining completes.
+_MODEL_META_TTL = 60.0
+_model_meta_cache: Dict[str, Any] = {}
+
+def _meta_cache_get(key: str) -> Optional[Any]:
+    entry = _model_meta_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+def _meta_cache_put(key: str, value: Any) -> None:
+    _model_meta_cache[key] = (time.monotonic() + _MODEL_META_TTL, value)
+
+# Neutral feature set used to exercise the hot paths at startup
+WARMUP_FEATURES = ModelFeatures(
+    home_team_elo=1500.0,
+    away_team_elo=1500.0,
+    elo_spread=0.0,
+    home_team_form=2.5,
+    away_team_form=2.5,
+    home_team_rest_days=2,
+    away_team_rest_days=2,
+    home_team_win_pct=0.5,
+    away_team_win_pct=0.5
+)
+
+async def _warmup(engine: PredictionEngine):
+    """Exercise predict and predict_batch once so JIT compilation and
+    first-call model costs are paid at startup, not by the first user"""
+    try:
+        await engine.predict(
+            game_id="__warmup__",
+            features=WARMUP_FEATURES,
+            prediction_types=[PredictionType.WIN_PROBABILITY],
+            include_explanation=False
+        )
+        await engine.predict_batch([
+            PredictionRequest(
+                game_id=f"__warmup_{i}__",
+                features=WARMUP_FEATURES,
+                include_explanation=False
+            )
+            for i in range(2)
+        ])
+        logger.info("Warmup predictions complete")
+    except Exception as e:
+        # Warmup is best-effort; never block startup on it
+        logger.warning(f"Warmup failed: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    global prediction_engine, cache_manager
-    
+    global prediction_engine, cache_manager, batch_coalescer, retrain_executor, _health_task
+
     try:
-        logger.info("Starting Nova Titan ML Service...")
-        
         settings = get_settings()
-        
+
+        # Re-register the log sink with enqueue=True so formatting and
+        # I/O happen off the request path; structured JSON in production
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level=settings.LOG_LEVEL,
+            enqueue=True,
+            serialize=settings.ENVIRONMENT == "production"
+        )
+
+        logger.info("Starting Nova Titan ML Service...")
+
+        # Pin this worker to a core so the scheduler doesn't migrate it
+        # and invalidate the model's cache lines; APP_WORKER_ID is set by
+        # the gunicorn post_fork hook
+        if settings.PIN_WORKERS and hasattr(os, "sched_setaffinity"):
+            cpu = int(os.getenv("APP_WORKER_ID", "0")) % (os.cpu_count() or 1)
+            os.sched_setaffinity(0, {cpu})
+            logger.info(f"Worker pinned to CPU {cpu}")
+
         # Initialize cache
         cache_manager = CacheManager(settings.REDIS_URL)
         await cache_manager.initialize()
@@ -50,40 +151,89 @@ async def lifespan(app: FastAPI):
         # Initialize prediction engine
         prediction_engine = PredictionEngine(
             model_path=settings.MODEL_PATH,
-            cache_manager=cache_manager
+            cache_manager=cache_manager,
+            preloaded_booster=_preloaded_booster
         )
         await prediction_engine.initialize()
         logger.info("Prediction engine initialized")
-        
+
+        # Pre-warm JITs and model buffers before serving traffic
+        if settings.WARMUP:
+            await _warmup(prediction_engine)
+
+        # Coalesce concurrent single predictions into micro-batches
+        if settings.ENABLE_COALESCING:
+            batch_coalescer = BatchCoalescer(
+                prediction_engine,
+                max_batch=settings.COALESCE_MAX_BATCH,
+                max_wait_ms=settings.COALESCE_MAX_WAIT_MS
+            )
+            await batch_coalescer.start()
+
+        # Dedicated process for CPU-bound retraining so it never blocks
+        # the serving event loop
+        retrain_executor = ProcessPoolExecutor(max_workers=1)
+
+        # Background health probe backing /health
+        _health_task = asyncio.create_task(_refresh_health_loop())
+
         logger.info("ML Service startup complete")
         yield
-        
+
     except Exception as e:
         logger.error(f"Startup error: {e}")
         raise
     finally:
         logger.info("Shutting down ML Service...")
+        if _health_task:
+            _health_task.cancel()
+        if retrain_executor:
+            retrain_executor.shutdown(wait=False, cancel_futures=True)
+        if batch_coalescer:
+            await batch_coalescer.stop()
         if cache_manager:
             await cache_manager.close()
 
+# With gunicorn --preload this module is imported once in the parent
+# process; loading the booster here puts its arrays in copy-on-write
+# pages shared by all forked workers instead of N private copies.
+_preloaded_booster = None
+if get_settings().PRELOAD_MODEL:
+    from pathlib import Path
+    import lightgbm as lgb
+
+    _booster_file = Path(get_settings().MODEL_PATH) / "lightgbm_model.txt"
+    if _booster_file.exists():
+        _preloaded_booster = lgb.Booster(model_file=str(_booster_file))
+        logger.info("LightGBM booster preloaded for prefork sharing")
+    else:
+        logger.warning(f"PRELOAD_MODEL set but {_booster_file} not found")
+
 # Create FastAPI app
+_is_production = get_settings().ENVIRONMENT == "production"
+
 app = FastAPI(
     title="Nova Titan ML Service",
     description="AI-powered sports prediction engine with LightGBM and ensemble models",
     version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
+    # Schema docs are dev-only; generating them costs startup time and
+    # exposes internals in production
+    docs_url=None if _is_production else "/docs",
+    redoc_url=None if _is_production else "/redoc",
+    default_response_class=ORJSONResponse,  # C JSON serializer for all responses
     lifespan=lifespan
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS runs in Python for every request (including OPTIONS preflights),
+# so in production it is terminated at the reverse proxy instead
+if not _is_production:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 def get_prediction_engine() -> PredictionEngine:
     """Dependency to get prediction engine"""
@@ -97,16 +247,25 @@ def get_cache_manager() -> CacheManager:
         raise HTTPException(status_code=503, detail="Cache manager not initialized")
     return cache_manager
 
+# Reusable annotated dependencies: the signature is parsed once at route
+# registration instead of per-endpoint definition
+EngineDep = Annotated[PredictionEngine, Depends(get_prediction_engine)]
+CacheDep = Annotated[CacheManager, Depends(get_cache_manager)]
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint
+
+    Served from the cached background probe, so kubernetes probe
+    pressure never translates into Redis traffic.
+    """
     try:
-        engine_status = "up" if prediction_engine and prediction_engine.is_healthy() else "down"
-        cache_status = "up" if cache_manager and await cache_manager.is_healthy() else "down"
-        
+        engine_status = _HEALTH["prediction_engine"]
+        cache_status = _HEALTH["cache"]
+
         overall_status = "healthy" if engine_status == "up" and cache_status == "up" else "degraded"
-        
-        return HealthResponse(
+
+        return HealthResponse.model_construct(
             status=overall_status,
             version="1.0.0",
             model_version=prediction_engine.model_version if prediction_engine else "unknown",
@@ -126,21 +285,52 @@ async def health_check():
 @app.post("/predict", response_model=PredictionResponse)
 async def predict_game(
     request: PredictionRequest,
-    engine: PredictionEngine = Depends(get_prediction_engine)
+    engine: EngineDep
 ):
     """Generate prediction for a single game"""
     try:
-        logger.info(f"Prediction request for game {request.game_id}")
-        
-        # Generate prediction
-        prediction = await engine.predict(
-            game_id=request.game_id,
-            features=request.features,
-            prediction_types=request.prediction_types,
-            include_explanation=request.include_explanation
-        )
+        logger.bind(game_id=request.game_id).debug("prediction_request")
+
+        # Read-through cache for explanation-free requests, keyed by a
+        # content hash of the features and requested prediction types
+        # (stable across workers, unlike Python's salted hash())
+        cache_key = None
+        if cache_manager and not request.include_explanation:
+            payload = orjson.dumps(
+                {
+                    "features": request.features.dict() if request.features else None,
+                    "types": [t.value for t in request.prediction_types]
+                },
+                option=orjson.OPT_SORT_KEYS
+            )
+            cache_key = f"pred:{request.game_id}:{xxhash.xxh64_intdigest(payload)}"
+            cached = await cache_manager.get(cache_key)
+            if cached:
+                logger.debug(f"Prediction cache hit for game {request.game_id}")
+                return PredictionResponse.model_construct(**cached)
+
+        # Generate prediction; explanation-free requests go through the
+        # coalescer so concurrent callers share one batched model call
+        if batch_coalescer and not request.include_explanation:
+            prediction = await batch_coalescer.submit(request)
+        else:
+            prediction = await engine.predict(
+                game_id=request.game_id,
+                features=request.features,
+                prediction_types=request.prediction_types,
+                include_explanation=request.include_explanation
+            )
         
-        return PredictionResponse(
+        if cache_key:
+            await cache_manager.set(
+                cache_key,
+                prediction.dict(),
+                ttl=get_settings().PREDICTION_TTL
+            )
+
+        # The engine already validated these fields; model_construct
+        # skips a second round of per-field validation
+        return PredictionResponse.model_construct(
             game_id=request.game_id,
             predictions=prediction.predictions,
             explanation=prediction.explanation,
@@ -156,19 +346,24 @@ async def predict_game(
 @app.post("/predict/batch", response_model=BatchPredictionResponse)
 async def predict_batch(
     request: BatchPredictionRequest,
-    engine: PredictionEngine = Depends(get_prediction_engine)
+    engine: EngineDep
 ):
     """Generate predictions for multiple games"""
     try:
-        logger.info(f"Batch prediction request for {len(request.game_requests)} games")
-        
-        # Process predictions concurrently
-        predictions = await engine.predict_batch(request.game_requests)
-        
-        return BatchPredictionResponse(
+        total_games = len(request.game_requests)
+        logger.bind(total_games=total_games).debug("batch_prediction_request")
+
+        # Process predictions concurrently, bounded by the request's limit
+        predictions = await engine.predict_batch(
+            request.game_requests,
+            max_concurrent=request.max_concurrent
+        )
+
+        return BatchPredictionResponse.build_trusted(
             predictions=predictions,
-            total_games=len(request.game_requests),
-            successful_predictions=len([p for p in predictions if p.predictions]),
+            total_games=total_games,
+            # Single pass, no throwaway list allocation
+            successful_predictions=sum(1 for p in predictions if p.predictions),
             batch_id=f"batch_{asyncio.current_task().get_name()}"
         )
         
@@ -176,15 +371,54 @@ async def predict_batch(
         logger.error(f"Batch prediction error: {e}")
         raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
 
+@app.post("/predict/batch/stream")
+async def predict_batch_stream(
+    raw_request: Request,
+    engine: EngineDep
+):
+    """Stream batch predictions as NDJSON, one prediction per line
+
+    Serialization is constant-memory and the first line arrives as soon
+    as the first prediction completes; prefer this over /predict/batch
+    for large batches.
+
+    The body is validated straight from raw bytes through the
+    pre-compiled TypeAdapter: one parse+validate pass in pydantic-core
+    instead of FastAPI's bytes -> dict -> model round trip.
+    """
+    try:
+        request = _BATCH_REQ_ADAPTER.validate_json(await raw_request.body())
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+    logger.bind(total_games=len(request.game_requests)).debug("batch_prediction_stream")
+
+    async def generate():
+        async for prediction in engine.predict_batch_iter(
+            request.game_requests,
+            max_concurrent=request.max_concurrent
+        ):
+            yield orjson.dumps(
+                prediction.dict(),
+                option=orjson.OPT_NON_STR_KEYS
+            ) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.get("/model/performance", response_model=ModelPerformanceResponse)
 async def get_model_performance(
-    engine: PredictionEngine = Depends(get_prediction_engine)
+    engine: EngineDep
 ):
     """Get model performance metrics"""
     try:
+        cached = _meta_cache_get("performance")
+        if cached:
+            return cached
+
         performance = await engine.get_performance_metrics()
-        
-        return ModelPerformanceResponse(
+
+        # Fields come from the engine's validated metrics object
+        response = ModelPerformanceResponse.model_construct(
             accuracy=performance.accuracy,
             log_loss=performance.log_loss,
             auc_roc=performance.auc_roc,
@@ -194,53 +428,83 @@ async def get_model_performance(
             training_samples=performance.training_samples,
             model_version=performance.model_version
         )
-        
+        _meta_cache_put("performance", response)
+        return response
+
     except Exception as e:
         logger.error(f"Performance metrics error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get performance metrics: {str(e)}")
 
 @app.post("/model/retrain")
 async def retrain_model(
-    engine: PredictionEngine = Depends(get_prediction_engine)
+    engine: EngineDep
 ):
     """Trigger model retraining"""
+    if engine.retrain_in_progress:
+        raise HTTPException(status_code=409, detail="Retraining already in progress")
+
     try:
         logger.info("Manual model retraining triggered")
-        
-        # Start retraining in background
-        asyncio.create_task(engine.retrain_model())
-        
+
+        # Retraining is CPU-bound: run it in the dedicated worker process,
+        # then hot-reload artifacts and drop stale metadata caches
+        engine.retrain_in_progress = True
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            retrain_executor, retrain_models, str(engine.model_path)
+        )
+
+        async def _finish_retrain():
+            try:
+                await future
+                await engine.reload_models()
+                logger.info("Retrained models reloaded")
+            except Exception as e:
+                logger.error(f"Retraining failed: {e}")
+            finally:
+                engine.retrain_in_progress = False
+                _model_meta_cache.clear()
+
+        asyncio.create_task(_finish_retrain())
+
         return {
             "message": "Model retraining started",
             "status": "in_progress"
         }
-        
+
     except Exception as e:
+        engine.retrain_in_progress = False
         logger.error(f"Retraining error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to start retraining: {str(e)}")
 
 @app.get("/model/features")
 async def get_feature_info(
-    engine: PredictionEngine = Depends(get_prediction_engine)
+    engine: EngineDep
 ):
     """Get information about model features"""
     try:
+        cached = _meta_cache_get("features")
+        if cached:
+            return cached
+
         feature_info = await engine.get_feature_info()
-        
-        return {
+
+        response = {
             "features": feature_info.feature_names,
             "feature_importance": feature_info.feature_importance,
             "feature_descriptions": feature_info.feature_descriptions,
             "total_features": len(feature_info.feature_names)
         }
-        
+        _meta_cache_put("features", response)
+        return response
+
     except Exception as e:
         logger.error(f"Feature info error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get feature info: {str(e)}")
 
 @app.get("/cache/stats")
 async def get_cache_stats(
-    cache: CacheManager = Depends(get_cache_manager)
+    cache: CacheDep
 ):
     """Get cache statistics"""
     try:
@@ -252,7 +516,7 @@ async def get_cache_stats(
 
 @app.delete("/cache/clear")
 async def clear_cache(
-    cache: CacheManager = Depends(get_cache_manager)
+    cache: CacheDep
 ):
     """Clear prediction cache"""
     try:
@@ -267,10 +531,17 @@ async def clear_cache(
 
 if __name__ == "__main__":
     # Run the server
+    # uvloop + httptools replace the stdlib event loop and HTTP parser with
+    # C implementations (both ship with uvicorn[standard]). Worker count is
+    # tunable via WEB_CONCURRENCY; reload mode forces a single worker.
+    is_development = os.getenv("ENVIRONMENT") == "development"
     uvicorn.run(
-        "main:app",
+        "ml.main:app",
         host="0.0.0.0",
         port=3002,
-        reload=os.getenv("ENVIRONMENT") == "development",
+        loop="uvloop",
+        http="httptools",
+        workers=1 if is_development else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        reload=is_development,
         log_level="info"
     )
\ No newline at end of file
@@ -0,0 +1 @@
+"""Prediction engine, feature builder, and training utilities"""
@@ -0,0 +1,172 @@
+"""
+Nova Titan Feature Builder
+Assembles model-ready feature vectors from game features
+"""
+
+import numpy as np
+from typing import List, Optional
+from loguru import logger
+
+from ..schemas.prediction_schemas import (
+    FEATURE_NAMES, ModelFeatures, ModelFeaturesBatch
+)
+
+# Numba is optional: when available the batch assembly kernel is JIT-compiled
+# to native code; otherwise we fall back to the pure-NumPy path below.
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - depends on environment
+    HAS_NUMBA = False
+
+# The canonical feature order (FEATURE_NAMES) is introspected from
+# ModelFeatures in the schemas module, so the matrix layout can't drift
+# from the model definition. Optional fields are encoded as NaN in the
+# raw matrix and replaced with neutral defaults by the kernel; the
+# column indices hardcoded below follow that order.
+
+# Neutral defaults substituted for missing optional features
+_RATING_DEFAULT = 110.0  # League-average off/def rating
+_TEMPERATURE_DEFAULT = 72.0
+_WIND_SPEED_DEFAULT = 0.0
+
+
+def _assemble_rows(raw, out):
+    """Fill `out` from `raw`, deriving elo_spread and patching NaN defaults"""
+    for i in range(raw.shape[0]):
+        for j in range(raw.shape[1]):
+            out[i, j] = raw[i, j]
+        # Derived feature: always recompute from the Elo columns
+        out[i, 2] = raw[i, 0] - raw[i, 1]
+        # Optional advanced ratings (columns 9-12)
+        for j in range(9, 13):
+            if np.isnan(raw[i, j]):
+                out[i, j] = _RATING_DEFAULT
+        # Weather (columns 16-17)
+        if np.isnan(raw[i, 16]):
+            out[i, 16] = _TEMPERATURE_DEFAULT
+        if np.isnan(raw[i, 17]):
+            out[i, 17] = _WIND_SPEED_DEFAULT
+        # Injury impacts (columns 19-20) are documented as 0-1 factors
+        for j in range(19, 21):
+            if out[i, j] < 0.0:
+                out[i, j] = 0.0
+            elif out[i, j] > 1.0:
+                out[i, j] = 1.0
+
+
+if HAS_NUMBA:
+    # No fastmath here: it assumes no NaNs exist and compiles the
+    # np.isnan checks to constant False, so the NaN-to-default patching
+    # for optional columns would never run.
+    @njit(cache=True, parallel=True)
+    def build_feature_matrix(raw, out):  # pragma: no cover - compiled
+        for i in prange(raw.shape[0]):
+            for j in range(raw.shape[1]):
+                out[i, j] = raw[i, j]
+            out[i, 2] = raw[i, 0] - raw[i, 1]
+            for j in range(9, 13):
+                if np.isnan(raw[i, j]):
+                    out[i, j] = _RATING_DEFAULT
+            if np.isnan(raw[i, 16]):
+                out[i, 16] = _TEMPERATURE_DEFAULT
+            if np.isnan(raw[i, 17]):
+                out[i, 17] = _WIND_SPEED_DEFAULT
+            for j in range(19, 21):
+                if out[i, j] < 0.0:
+                    out[i, j] = 0.0
+                elif out[i, j] > 1.0:
+                    out[i, j] = 1.0
+else:
+    build_feature_matrix = _assemble_rows
+
+
+class FeatureBuilder:
+    """Builds feature vectors/matrices for the prediction engine"""
+
+    def __init__(self):
+        self.feature_names: List[str] = list(FEATURE_NAMES)
+        self.n_features = len(FEATURE_NAMES)
+
+    def warmup(self):
+        """Trigger JIT compilation on a dummy batch so the first real
+        request doesn't pay the Numba compile cost"""
+        if HAS_NUMBA:
+            dummy = np.zeros((2, self.n_features), dtype=np.float32)
+            build_feature_matrix(dummy, np.empty_like(dummy))
+            logger.debug("Feature assembly kernel warmed up")
+
+    def _raw_row(self, features: ModelFeatures) -> List[float]:
+        """Extract raw feature values in canonical order (NaN for missing)"""
+        return [
+            features.home_team_elo,
+            features.away_team_elo,
+            features.elo_spread,
+            features.home_team_form,
+            features.away_team_form,
+            float(features.home_team_rest_days),
+            float(features.away_team_rest_days),
+            features.home_team_win_pct,
+            features.away_team_win_pct,
+            np.nan if features.home_team_off_rating is None else features.home_team_off_rating,
+            np.nan if features.home_team_def_rating is None else features.home_team_def_rating,
+            np.nan if features.away_team_off_rating is None else features.away_team_off_rating,
+            np.nan if features.away_team_def_rating is None else features.away_team_def_rating,
+            1.0 if features.is_playoff else 0.0,
+            1.0 if features.is_back_to_back else 0.0,
+            features.venue_advantage,
+            np.nan if features.temperature is None else features.temperature,
+            np.nan if features.wind_speed is None else features.wind_speed,
+            1.0 if features.precipitation else 0.0,
+            features.home_team_injury_impact,
+            features.away_team_injury_impact,
+        ]
+
+    def build_from_features(self, features: ModelFeatures) -> np.ndarray:
+        """Build a single feature vector from provided game features"""
+        return self.build_matrix([features])[0]
+
+    def build_matrix(self, features_list: List[ModelFeatures]) -> np.ndarray:
+        """Build an (N, F) float32 feature matrix for a batch of games
+
+        Raw values are gathered in Python (attribute access), then the
+        derive-and-default pass runs through the compiled kernel.
+        """
+        raw = np.array(
+            [self._raw_row(f) for f in features_list],
+            dtype=np.float32
+        )
+        out = np.empty((len(features_list), self.n_features), dtype=np.float32)
+        build_feature_matrix(raw, out)
+        return out
+
+    def build_from_batch(self, batch: ModelFeaturesBatch) -> np.ndarray:
+        """Post-process a SoA feature batch in place and return its matrix
+
+        The batch columns follow the canonical layout, so the fused
+        kernel (derived features, NaN defaults, range clipping) runs
+        directly over the contiguous buffer with no per-row attribute
+        access.
+        """
+        build_feature_matrix(batch.data, batch.data)
+        return batch.data
+
+    async def build_from_game_id(self, game_id: str) -> np.ndarray:
+        """Build features by fetching game data
+
+        Real data integration is not wired up yet, so this returns a
+        neutral feature vector (league-average profile) for demo mode.
+        """
+        logger.debug(f"Building default features for game {game_id}")
+        neutral = ModelFeatures(
+            home_team_elo=1500.0,
+            away_team_elo=1500.0,
+            elo_spread=0.0,
+            home_team_form=2.5,
+            away_team_form=2.5,
+            home_team_rest_days=2,
+            away_team_rest_days=2,
+            home_team_win_pct=0.5,
+            away_team_win_pct=0.5,
+        )
+        return self.build_from_features(neutral)
@@ -4,9 +4,21 @@ Main ML prediction service with LightGBM and ensemble models
 """
 
 import asyncio
+import os
+import threading
+import time
+
+# Keep the native libraries single-threaded: parallelism comes from the
+# asyncio thread pool and uvicorn workers, and oversubscribing cores
+# hurts latency. Must be set before LightGBM/NumPy import OpenMP/BLAS.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
 import joblib
 import numpy as np
 import pandas as pd
+import xxhash
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
@@ -24,47 +36,312 @@ from sklearn.metrics import accuracy_score, log_loss, roc_auc_score, brier_score
 from .feature_builder import FeatureBuilder
 from .model_trainer import ModelTrainer
 from ..schemas.prediction_schemas import (
-    PredictionResult, ModelFeatures, PredictionType,
-    ModelPerformance, FeatureInfo, PredictionExplanation
+    PredictionResult, ModelFeatures, ModelFeaturesBatch, PredictionType,
+    ModelPerformance, FeatureInfo, FeatureImportanceTable,
+    PredictionExplanation
 )
 from ..utils.cache import CacheManager
 from ..utils.config import get_settings
+from ..utils.fastmath import sigmoid, sigmoid_scalar
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Version tag stored with cached predictions. Cache hits skip pydantic
+# revalidation (the cache is an internal trust boundary), so the tag is
+# what invalidates entries when the result schema drifts.
+_CACHE_SCHEMA_VERSION = 1
+
+
+def _result_from_cache(entry: Dict[str, Any]) -> Optional[PredictionResult]:
+    """Rebuild a cached prediction without field revalidation"""
+    if entry.pop('_cache_v', None) != _CACHE_SCHEMA_VERSION:
+        return None
+    return PredictionResult.model_construct(**entry)
+
+
+def _result_to_cache(result: PredictionResult) -> Dict[str, Any]:
+    """Serializable form of a prediction, tagged for schema drift"""
+    entry = result.dict()
+    entry['_cache_v'] = _CACHE_SCHEMA_VERSION
+    return entry
+
+
+def _combine(features, mean, inv, lr_coef, lr_intercept, lr_a, lr_b,
+             lgb_p, rf_p, w):
+    """Scale, logistic logit, Platt sigmoid, weighted sum, and agreement
+    std in one kernel
+
+    The arithmetic here is sub-microsecond, so when run as separate
+    NumPy calls the interpreter dispatch dominates; a single jitted
+    pass removes that overhead from every prediction. lr_a/lr_b are the
+    Platt calibration terms (sklearn convention: p = expit(-(a*z + b))).
+    """
+    n = features.shape[0]
+    logit = lr_intercept
+    for i in range(n):
+        logit += (features[i] - mean[i]) * inv[i] * lr_coef[i]
+    lr_p = 1.0 / (1.0 + np.exp(lr_a * logit + lr_b))
+    probs = np.empty(3)
+    probs[0] = lgb_p
+    probs[1] = lr_p
+    probs[2] = rf_p
+    return w @ probs, probs.std()
+
+
+if HAS_NUMBA:
+    _combine = numba.njit(cache=True, fastmath=True)(_combine)
+
+
+class _FastSingleRowPredictor:
+    """Wrapper around LightGBM's PredictForMatSingleRowFast C API
+
+    The standard predict_proba path allocates buffers and fans out to the
+    OMP thread pool on every call, which is pure overhead for 1xN input.
+    FastInit pre-binds the row shape, dtype, and thread config once; each
+    predict is then a single C call into a preallocated output buffer.
+    """
+
+    def __init__(self, booster, num_features: int):
+        import ctypes
+        from lightgbm.basic import _LIB, _safe_call
+
+        self._ctypes = ctypes
+        self._LIB = _LIB
+        self._safe_call = _safe_call
+        # The fast-config handle reuses internal prediction buffers, so
+        # concurrent predicts through one handle race; predictions run
+        # from to_thread workers, hence the lock.
+        self._lock = threading.Lock()
+
+        booster_handle = getattr(booster, '_handle', None) or booster.handle
+        self._fast_handle = ctypes.c_void_p()
+        _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFastInit(
+            booster_handle,
+            ctypes.c_int(0),    # C_API_PREDICT_NORMAL
+            ctypes.c_int(0),    # start_iteration
+            ctypes.c_int(-1),   # num_iteration (all)
+            ctypes.c_int(0),    # C_API_DTYPE_FLOAT32
+            ctypes.c_int(num_features),
+            ctypes.c_char_p(b"num_threads=1"),
+            ctypes.byref(self._fast_handle)
+        ))
+        # Binary objective: one probability per row
+        self._out_buf = (ctypes.c_double * 1)()
+        self._out_len = ctypes.c_int64()
+
+    def predict_one(self, row: np.ndarray) -> float:
+        """Predict the positive-class probability for a single row"""
+        ctypes = self._ctypes
+        row = np.ascontiguousarray(row, dtype=np.float32)
+        with self._lock:
+            self._safe_call(self._LIB.LGBM_BoosterPredictForMatSingleRowFast(
+                self._fast_handle,
+                row.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+                ctypes.byref(self._out_len),
+                self._out_buf
+            ))
+            return float(self._out_buf[0])
+
+    def __del__(self):
+        try:
+            self._LIB.LGBM_FastConfigFree(self._fast_handle)
+        except Exception:
+            pass
+
+
+class _TreelitePredictor:
+    """Adapter giving a treelite_runtime Predictor the same
+    predict(X) -> probabilities interface as an lleaves model"""
+
+    def __init__(self, predictor):
+        import treelite_runtime
+        self._predictor = predictor
+        self._dmatrix = treelite_runtime.DMatrix
+
+    def predict(self, X):
+        return self._predictor.predict(self._dmatrix(X))
+
 
 class PredictionEngine:
     """Main prediction engine with ensemble models"""
     
-    def __init__(self, model_path: str, cache_manager: Optional[CacheManager] = None):
+    def __init__(
+        self,
+        model_path: str,
+        cache_manager: Optional[CacheManager] = None,
+        preloaded_booster: Optional[lgb.Booster] = None
+    ):
         self.model_path = Path(model_path)
         self.cache_manager = cache_manager
         self.settings = get_settings()
+        # Booster loaded pre-fork so workers share its pages (gunicorn
+        # --preload); used for win-probability predict when present
+        self._shared_booster = preloaded_booster
         
         # Model components
         self.lightgbm_model: Optional[lgb.LGBMClassifier] = None
         self.logistic_model: Optional[LogisticRegression] = None
-        self.random_forest_model: Optional[RandomForestClassifier] = None
-        self.ensemble_weights: Dict[str, float] = {}
+        # LightGBM rf booster; legacy artifacts may still hold a sklearn
+        # RandomForestClassifier, which every consumer handles
+        self.random_forest_model = None
+        self.ensemble_weights: Dict[str, float] = {
+            'lightgbm': 0.5, 'logistic': 0.3, 'random_forest': 0.2
+        }
+        # Weights as a vector so the ensemble combine is one dot product
+        self._weight_vec = self._build_weight_vec()
+        # Native-compiled LightGBM booster (lleaves), used when available
+        self._compiled_lgbm = None
+        # Pre-initialized single-row fast predict path (C API FastConfig)
+        self._fast_lgbm: Optional[_FastSingleRowPredictor] = None
         
         # Feature processing
         self.feature_builder = FeatureBuilder()
         self.scaler: Optional[StandardScaler] = None
+        # Scaler affine terms; mmap-backed when loaded from disk
+        self._scaler_mean: Optional[np.ndarray] = None
+        self._scaler_scale: Optional[np.ndarray] = None
+        # float32 mean and reciprocal scale for the hot path: scaling is
+        # then a subtract and a multiply with no sklearn validator pass
+        self._mean: Optional[np.ndarray] = None
+        self._inv: Optional[np.ndarray] = None
+        # Logistic coefficients and Platt calibration terms averaged
+        # across calibration folds, feeding the jitted combine kernel.
+        # Defaults (a=-1, b=0) make the Platt sigmoid a plain sigmoid.
+        self._lr_coef: Optional[np.ndarray] = None
+        self._lr_intercept: float = 0.0
+        self._lr_a: float = -1.0
+        self._lr_b: float = 0.0
+        # Per-tree positive-class probabilities indexed by leaf id, for
+        # vectorized forest prediction without the per-tree Python loop
+        self._rf_leaf_values: Optional[np.ndarray] = None
+        # Skip the rest of the ensemble when LightGBM alone is this far
+        # from the decision boundary; recalibrated on the validation set
+        self._early_exit_tau = 0.35
+        self._early_exit_count = 0
+        self._predict_count = 0
+        # Engine-level dynamic batching (Triton-style): single-row calls
+        # queue up here and a worker coroutine drains them into one
+        # matrix predict; created in initialize() when enabled
+        self._inbox: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
         self.feature_names: List[str] = []
         
         # Model metadata
         self.model_version = "1.0.0"
         self.last_trained: Optional[datetime] = None
         self.is_trained = False
+        self.retrain_in_progress = False
         
         # Performance tracking
         self.performance_metrics: Optional[ModelPerformance] = None
+        # Sorted feature importance, computed once per train/load.
+        # Columnar table for internal consumers, plus the dict-row form
+        # kept for metadata persistence and the response paths.
+        self._feature_importance_table: Optional[FeatureImportanceTable] = None
+        self._feature_importance_cache: Optional[List[Dict[str, Any]]] = None
         
         logger.info(f"Prediction engine initialized with model path: {model_path}")
 
+    def _build_weight_vec(self) -> np.ndarray:
+        """Ensemble weights in model order (lightgbm, logistic, rf)"""
+        return np.array(
+            [self.ensemble_weights[k] for k in ('lightgbm', 'logistic', 'random_forest')],
+            dtype=np.float64
+        )
+
+    def _refresh_scaler_affine(self):
+        """Precompute float32 mean and reciprocal scale for scaling
+
+        scaler.transform runs sklearn's input validator and allocates on
+        every call, which dominates single-row inference; a cached
+        (x - mean) * inv is two vector ops.
+        """
+        if self._scaler_mean is not None and self._scaler_scale is not None:
+            self._mean = np.ascontiguousarray(self._scaler_mean, dtype=np.float32)
+            self._inv = np.ascontiguousarray(
+                1.0 / np.asarray(self._scaler_scale), dtype=np.float32
+            )
+
+    def _scale_features(self, X: np.ndarray) -> np.ndarray:
+        """Apply the standard scaler as a plain affine op (2D in, 2D out)"""
+        if self._mean is not None:
+            return (np.asarray(X, dtype=np.float32) - self._mean) * self._inv
+        return self.scaler.transform(X)
+
+    def _extract_lr_params(self):
+        """Fold the calibrated logistic into one linear + Platt sigmoid
+
+        CalibratedClassifierCV dispatches through one Python estimator
+        and one calibrator per fold at predict time; averaging the fold
+        coefficients and Platt (a, b) terms collapses the logistic leg
+        to a single dot product and sigmoid.
+        """
+        try:
+            folds = self.logistic_model.calibrated_classifiers_
+            estimators = [cc.estimator for cc in folds]
+            self._lr_coef = np.mean(
+                [est.coef_[0] for est in estimators], axis=0
+            ).astype(np.float64)
+            self._lr_intercept = float(
+                np.mean([est.intercept_[0] for est in estimators])
+            )
+            calibrators = [cc.calibrators[0] for cc in folds]
+            self._lr_a = float(np.mean([cal.a_ for cal in calibrators]))
+            self._lr_b = float(np.mean([cal.b_ for cal in calibrators]))
+        except Exception as e:
+            logger.debug(f"Logistic coefficient extraction unavailable: {e}")
+            self._lr_coef = None
+
+    def _lr_fast(self, xs: np.ndarray) -> np.ndarray:
+        """Calibrated logistic probabilities from the packed parameters"""
+        z = xs @ self._lr_coef + self._lr_intercept
+        return 1.0 / (1.0 + np.exp(self._lr_a * z + self._lr_b))
+
+    def _precompute_rf_leaves(self):
+        """Cache per-leaf class probabilities for the random forest
+
+        predict_proba walks a Python loop over 100 estimators and
+        allocates an output array per tree; with the leaf values
+        precomputed, prediction is one apply() per tree plus a single
+        fancy-indexed gather and mean. Trees have different node counts,
+        so the table is padded to the widest tree.
+        """
+        self._rf_leaf_values = None
+        if not isinstance(self.random_forest_model, RandomForestClassifier):
+            return
+        try:
+            estimators = self.random_forest_model.estimators_
+            max_nodes = max(t.tree_.node_count for t in estimators)
+            leaf_values = np.zeros((len(estimators), max_nodes), dtype=np.float64)
+            for i, t in enumerate(estimators):
+                counts = t.tree_.value[:, 0, :]
+                leaf_values[i, :t.tree_.node_count] = (
+                    counts[:, 1] / counts.sum(axis=1)
+                )
+            self._rf_leaf_values = leaf_values
+        except Exception as e:
+            logger.debug(f"RF leaf-value precompute unavailable: {e}")
+
+    def _rf_predict_proba_fast(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class forest probabilities via the leaf-value table"""
+        estimators = self.random_forest_model.estimators_
+        leaves = np.stack([t.apply(X) for t in estimators], axis=0)
+        probs = self._rf_leaf_values[np.arange(len(estimators))[:, None], leaves]
+        return probs.mean(axis=0)
+
     async def initialize(self):
         """Initialize the prediction engine"""
         try:
             # Create model directories
             self.model_path.mkdir(parents=True, exist_ok=True)
-            
+
+            # Compile the feature assembly kernel before serving traffic
+            self.feature_builder.warmup()
+
             # Try to load existing models
             await self._load_models()
             
@@ -72,7 +349,24 @@ class PredictionEngine:
             if not self.is_trained:
                 logger.info("No trained models found, training with mock data...")
                 await self._train_initial_models()
-            
+
+            # Optionally compile the booster to native code
+            if self.settings.USE_LLEAVES or self.settings.USE_TREELITE:
+                self._compile_booster()
+
+            # Pre-bind the single-row C predict path
+            self._init_fast_predict()
+
+            # Throwaway predicts so the first real request sees
+            # steady-state latency
+            if self.is_trained and self.settings.WARMUP:
+                self._warmup_models()
+
+            # Engine-level micro-batching of single-row predictions
+            if self.settings.ENGINE_MICRO_BATCH:
+                self._inbox = asyncio.Queue()
+                self._batch_task = asyncio.create_task(self._batch_worker())
+
             logger.info("Prediction engine initialization complete")
             
         except Exception as e:
@@ -98,7 +392,30 @@ class PredictionEngine:
                 self.logistic_model = joblib.load(model_files['logistic'])
                 self.random_forest_model = joblib.load(model_files['random_forest'])
                 self.scaler = joblib.load(model_files['scaler'])
-                
+
+                # Prefer the native booster artifact for inference: it
+                # skips pickle object-graph rebuild and every worker
+                # parses the same file instead of duplicating the
+                # LGBMClassifier pickle
+                booster_file = self.model_path / 'lightgbm_model.txt'
+                if self._shared_booster is None and booster_file.exists():
+                    self._shared_booster = lgb.Booster(model_file=str(booster_file))
+
+                # Scaler affine terms as memory-mapped arrays so the
+                # pages are shared read-only across worker processes
+                mean_file = self.model_path / 'scaler_mean.npy'
+                scale_file = self.model_path / 'scaler_scale.npy'
+                if mean_file.exists() and scale_file.exists():
+                    self._scaler_mean = np.load(mean_file, mmap_mode='r')
+                    self._scaler_scale = np.load(scale_file, mmap_mode='r')
+                else:
+                    self._scaler_mean = self.scaler.mean_
+                    self._scaler_scale = self.scaler.scale_
+                self._refresh_scaler_affine()
+                self._extract_lr_params()
+                self._precompute_rf_leaves()
+                self._refresh_feature_importance()
+
                 # Load metadata
                 metadata = joblib.load(model_files['metadata'])
                 self.model_version = metadata.get('version', '1.0.0')
@@ -107,6 +424,7 @@ class PredictionEngine:
                 self.ensemble_weights = metadata.get('ensemble_weights', {
                     'lightgbm': 0.5, 'logistic': 0.3, 'random_forest': 0.2
                 })
+                self._weight_vec = self._build_weight_vec()
                 self.performance_metrics = metadata.get('performance_metrics')
                 
                 self.is_trained = True
@@ -125,7 +443,17 @@ class PredictionEngine:
             joblib.dump(self.logistic_model, self.model_path / 'logistic_model.joblib')
             joblib.dump(self.random_forest_model, self.model_path / 'rf_model.joblib')
             joblib.dump(self.scaler, self.model_path / 'scaler.joblib')
-            
+
+            # Native booster file for prefork preloading and compilation.
+            # save_model already writes only up to best_iteration, so the
+            # early-stopped artifact carries no trailing dead trees.
+            booster_path = self.model_path / 'lightgbm_model.txt'
+            self.lightgbm_model.booster_.save_model(str(booster_path))
+
+            # Scaler affine terms as plain arrays for mmap-shared loading
+            np.save(self.model_path / 'scaler_mean.npy', self.scaler.mean_)
+            np.save(self.model_path / 'scaler_scale.npy', self.scaler.scale_)
+
             # Save metadata
             metadata = {
                 'version': self.model_version,
@@ -141,6 +469,110 @@ class PredictionEngine:
         except Exception as e:
             logger.error(f"Failed to save models: {e}")
 
+    def _compile_booster(self):
+        """Compile the LightGBM booster to native code (optional deps)
+
+        Per-row predict through the Python Booster carries substantial
+        constant overhead; a compiled tree library makes single-row
+        inference a plain native call. lleaves (LLVM) is preferred,
+        Treelite (gcc codegen with quantized splits) is the fallback.
+        Compiled artifacts are cached next to the joblib files so
+        restarts mmap them instead of recompiling.
+        """
+        model_txt = self.model_path / 'lightgbm_model.txt'
+        if not model_txt.exists() and self.lightgbm_model is not None:
+            self.lightgbm_model.booster_.save_model(str(model_txt))
+
+        if self.settings.USE_LLEAVES:
+            try:
+                import lleaves
+
+                # A cache compiled from a pre-retrain booster must not
+                # be reused; mtime ordering detects staleness
+                cache_path = self.model_path / 'lightgbm_model.ll'
+                if (cache_path.exists()
+                        and cache_path.stat().st_mtime < model_txt.stat().st_mtime):
+                    cache_path.unlink()
+                compiled = lleaves.Model(model_file=str(model_txt))
+                compiled.compile(cache=str(cache_path))
+                self._compiled_lgbm = compiled
+                logger.info("LightGBM booster compiled with lleaves")
+                return
+            except ImportError:
+                logger.warning("USE_LLEAVES is set but lleaves is not installed")
+            except Exception as e:
+                logger.warning(f"lleaves compilation failed: {e}")
+
+        if self.settings.USE_TREELITE:
+            try:
+                import treelite
+                import treelite_runtime
+
+                lib_path = self.model_path / 'treelite_predictor.so'
+                # Recompile when the booster artifact is newer than the
+                # library built from it
+                if (lib_path.exists()
+                        and lib_path.stat().st_mtime < model_txt.stat().st_mtime):
+                    lib_path.unlink()
+                if not lib_path.exists():
+                    tl_model = treelite.Model.load(str(model_txt), model_format='lightgbm')
+                    tl_model.export_lib(
+                        toolchain='gcc',
+                        libpath=str(lib_path),
+                        params={'parallel_comp': 8, 'quantize': 1}
+                    )
+                predictor = treelite_runtime.Predictor(str(lib_path), nthread=1)
+                self._compiled_lgbm = _TreelitePredictor(predictor)
+                logger.info("LightGBM booster compiled with Treelite")
+                return
+            except ImportError:
+                logger.warning("USE_TREELITE is set but treelite is not installed")
+            except Exception as e:
+                logger.warning(f"Treelite compilation failed: {e}")
+
+        if self._compiled_lgbm is None:
+            logger.info("Using stock LightGBM predict path")
+
+    def _warmup_models(self):
+        """Run a throwaway predict through every inference path
+
+        The first call to each model pays for lazy buffer allocation,
+        LightGBM thread-pool creation, and (for the combine kernel) the
+        Numba compile; doing it at startup keeps that cost off the first
+        API request.
+        """
+        try:
+            n_features = len(self.feature_names) or self.feature_builder.n_features
+            dummy = np.zeros((1, n_features), dtype=np.float32)
+
+            self._lgb_predict_one(dummy[0])
+            if self.lightgbm_model is not None:
+                self.lightgbm_model.predict_proba(dummy)
+            if self.random_forest_model is not None:
+                self._rf_predict_one(dummy[0])
+            scaled = self._scale_features(dummy)
+            if self.logistic_model is not None:
+                self.logistic_model.predict_proba(scaled)
+            self._combine_one(dummy[0], 0.5, 0.5)
+
+            logger.info("Model warmup complete")
+        except Exception as e:
+            logger.warning(f"Model warmup failed: {e}")
+
+    def _init_fast_predict(self):
+        """Pre-initialize LightGBM's single-row fast predict config"""
+        self._fast_lgbm = None
+        if not self.is_trained or self.lightgbm_model is None:
+            return
+        try:
+            self._fast_lgbm = _FastSingleRowPredictor(
+                self.lightgbm_model.booster_,
+                self.lightgbm_model.n_features_in_
+            )
+            logger.info("LightGBM single-row fast predict initialized")
+        except Exception as e:
+            logger.warning(f"Fast single-row predict unavailable: {e}")
+
     async def _train_initial_models(self):
         """Train initial models with mock data"""
         try:
@@ -148,8 +580,8 @@ class PredictionEngine:
             
             # Generate mock training data
             X_train, y_train, X_val, y_val = trainer.generate_mock_training_data(
-                n_samples=5000, 
-                n_features=25
+                n_samples=5000,
+                n_features=self.feature_builder.n_features
             )
             
             # Train ensemble models
@@ -167,10 +599,18 @@ class PredictionEngine:
     async def _train_ensemble(self, X_train, y_train, X_val, y_val):
         """Train ensemble of models"""
         try:
+            # Train in float32 so training and inference share the same
+            # dtype and LightGBM's binning is identical in both
+            X_train = np.ascontiguousarray(X_train, dtype=np.float32)
+            X_val = np.ascontiguousarray(X_val, dtype=np.float32)
+
             # Prepare feature scaler
             self.scaler = StandardScaler()
             X_train_scaled = self.scaler.fit_transform(X_train)
             X_val_scaled = self.scaler.transform(X_val)
+            self._scaler_mean = self.scaler.mean_
+            self._scaler_scale = self.scaler.scale_
+            self._refresh_scaler_affine()
             
             # Train LightGBM
             logger.info("Training LightGBM model...")
@@ -189,8 +629,10 @@ class PredictionEngine:
             self.lightgbm_model.fit(
                 X_train, y_train,
                 eval_set=[(X_val, y_val)],
-                callbacks=[lgb.early_stopping(stopping_rounds=50)],
-                verbose=False
+                callbacks=[
+                    lgb.early_stopping(stopping_rounds=50, verbose=False),
+                    lgb.log_evaluation(period=0)
+                ]
             )
             
             # Train Logistic Regression
@@ -203,35 +645,50 @@ class PredictionEngine:
             self.logistic_model.fit(X_train_scaled, y_train)
             
             # Calibrate logistic regression
+            # method='sigmoid' is sklearn's name for Platt scaling
             self.logistic_model = CalibratedClassifierCV(
-                self.logistic_model, 
-                method='platt', 
+                self.logistic_model,
+                method='sigmoid',
                 cv=3
             )
             self.logistic_model.fit(X_train_scaled, y_train)
-            
-            # Train Random Forest
+            self._extract_lr_params()
+
+            # Train Random Forest as a LightGBM rf booster: predict runs
+            # through the same C++ histogram traversal as the main model
+            # instead of sklearn's per-estimator Python loop, and the
+            # artifact is compilable by the same lleaves/Treelite step
             logger.info("Training Random Forest model...")
-            self.random_forest_model = RandomForestClassifier(
+            self.random_forest_model = lgb.LGBMClassifier(
+                boosting_type='rf',
                 n_estimators=100,
-                max_depth=10,
-                min_samples_split=10,
-                min_samples_leaf=5,
+                num_leaves=64,
+                bagging_fraction=0.7,
+                bagging_freq=1,
+                feature_fraction=0.8,
                 random_state=42,
                 class_weight='balanced',
-                n_jobs=-1
+                verbose=-1,
+                # Single-threaded: predictions already run on concurrent
+                # worker threads, and oversubscribing cores adds latency
+                n_jobs=1
             )
             self.random_forest_model.fit(X_train, y_train)
-            
+            self._precompute_rf_leaves()
+
             # Evaluate ensemble performance
             await self._evaluate_ensemble(X_val, y_val, X_val_scaled)
             
             # Generate feature names
-            self.feature_names = [f"feature_{i}" for i in range(X_train.shape[1])]
+            if X_train.shape[1] == self.feature_builder.n_features:
+                self.feature_names = list(self.feature_builder.feature_names)
+            else:
+                self.feature_names = [f"feature_{i}" for i in range(X_train.shape[1])]
             
             self.is_trained = True
             self.last_trained = datetime.utcnow()
-            
+            self._refresh_feature_importance()
+
             logger.info("Ensemble training complete")
             
         except Exception as e:
@@ -245,19 +702,27 @@ class PredictionEngine:
             lgb_pred = self.lightgbm_model.predict_proba(X_val)[:, 1]
             lr_pred = self.logistic_model.predict_proba(X_val_scaled)[:, 1]
             rf_pred = self.random_forest_model.predict_proba(X_val)[:, 1]
-            
-            # Ensemble prediction
-            ensemble_pred = (
-                self.ensemble_weights['lightgbm'] * lgb_pred +
-                self.ensemble_weights['logistic'] * lr_pred +
-                self.ensemble_weights['random_forest'] * rf_pred
-            )
+
+            # Ensemble prediction: one dot over the stacked probabilities
+            ensemble_pred = self._weight_vec @ np.stack([lgb_pred, lr_pred, rf_pred])
             
             # Calculate metrics
             accuracy = accuracy_score(y_val, ensemble_pred > 0.5)
             logloss = log_loss(y_val, ensemble_pred)
             auc_roc = roc_auc_score(y_val, ensemble_pred)
             brier_score = brier_score_loss(y_val, ensemble_pred)
+
+            # Calibrate the early-exit band: the smallest tau whose hybrid
+            # (LightGBM-only outside the band, full ensemble inside) keeps
+            # validation AUC within epsilon of the full ensemble
+            for tau in (0.20, 0.25, 0.30, 0.35, 0.40, 0.45):
+                hybrid = np.where(
+                    np.abs(lgb_pred - 0.5) > tau, lgb_pred, ensemble_pred
+                )
+                if roc_auc_score(y_val, hybrid) >= auc_roc - 0.005:
+                    self._early_exit_tau = tau
+                    break
+            logger.info(f"Early-exit threshold calibrated to {self._early_exit_tau}")
             
             self.performance_metrics = ModelPerformance(
                 accuracy=accuracy,
@@ -285,26 +750,37 @@ class PredictionEngine:
         self.last_trained = datetime.utcnow()
         self.feature_names = [f"demo_feature_{i}" for i in range(10)]
 
-    def _get_feature_importance(self) -> List[Dict[str, Any]]:
-        """Get feature importance from trained models"""
+    def _compute_feature_importance(self) -> Optional[FeatureImportanceTable]:
+        """Rank feature importances from the trained LightGBM model"""
         try:
             if self.lightgbm_model and hasattr(self.lightgbm_model, 'feature_importances_'):
-                importances = self.lightgbm_model.feature_importances_
-                return [
-                    {
-                        'feature': name,
-                        'importance': float(imp),
-                        'rank': rank + 1
-                    }
-                    for rank, (name, imp) in enumerate(
-                        sorted(zip(self.feature_names, importances), 
-                               key=lambda x: x[1], reverse=True)
-                    )
-                ]
-            return []
+                return FeatureImportanceTable.from_scores(
+                    self.feature_names,
+                    self.lightgbm_model.feature_importances_
+                )
+            return None
         except Exception as e:
             logger.error(f"Failed to get feature importance: {e}")
-            return []
+            return None
+
+    def _refresh_feature_importance(self) -> None:
+        """Recompute the importance ranking after a train or reload"""
+        self._feature_importance_table = self._compute_feature_importance()
+        self._feature_importance_cache = (
+            self._feature_importance_table.to_dicts()
+            if self._feature_importance_table is not None else []
+        )
+
+    def _get_feature_importance(self) -> List[Dict[str, Any]]:
+        """Sorted feature importance, cached between retrains
+
+        Importance is static until the next train/reload, so per-request
+        callers (explanations, /model/features) read the cached ranking
+        instead of re-sorting every time.
+        """
+        if self._feature_importance_cache is None:
+            self._refresh_feature_importance()
+        return self._feature_importance_cache
 
     async def predict(
         self, 
@@ -315,21 +791,32 @@ class PredictionEngine:
     ) -> PredictionResult:
         """Generate prediction for a game"""
         try:
-            # Check cache first
-            cache_key = f"prediction:{game_id}:{hash(str(features))}"
-            if self.cache_manager:
-                cached_result = await self.cache_manager.get(cache_key)
-                if cached_result:
-                    logger.debug(f"Returning cached prediction for game {game_id}")
-                    return PredictionResult.parse_obj(cached_result)
-            
             # Generate or extract features
             if features:
                 feature_vector = self.feature_builder.build_from_features(features)
             else:
                 # Fetch game data and build features
                 feature_vector = await self.feature_builder.build_from_game_id(game_id)
-            
+
+            # float32 is LightGBM's native representation after binning;
+            # a contiguous cast up front halves memory traffic and makes
+            # every downstream reshape a no-copy view
+            feature_vector = np.ascontiguousarray(feature_vector, dtype=np.float32)
+
+            # Content-hash the feature vector for the cache key. Python's
+            # hash() is salted per process, so keys never matched across
+            # workers; xxh3 over the raw float32 bytes is stable and avoids
+            # formatting the whole model into a string on the hot path.
+            feature_digest = xxhash.xxh3_64_intdigest(feature_vector.tobytes())
+            cache_key = f"prediction:{game_id}:{feature_digest}"
+            if self.cache_manager:
+                cached_result = await self.cache_manager.get(cache_key)
+                if cached_result:
+                    result = _result_from_cache(cached_result)
+                    if result is not None:
+                        logger.debug(f"Returning cached prediction for game {game_id}")
+                        return result
+
             # Generate predictions
             predictions = {}
             
@@ -355,7 +842,7 @@ class PredictionEngine:
             if include_explanation:
                 explanation = await self._generate_explanation(feature_vector, predictions)
             
-            result = PredictionResult(
+            result = PredictionResult.build_trusted(
                 game_id=game_id,
                 predictions=predictions,
                 explanation=explanation,
@@ -368,9 +855,16 @@ class PredictionEngine:
                 created_at=datetime.utcnow()
             )
             
-            # Cache result
+            # Cache write-behind: the caller shouldn't pay the Redis
+            # round-trip as tail latency, and set() already swallows
+            # failures, so fire-and-forget is safe
             if self.cache_manager:
-                await self.cache_manager.set(cache_key, result.dict(), ttl=3600)
+                asyncio.create_task(
+                    self.cache_manager.set(
+                        cache_key, _result_to_cache(result),
+                        ttl=self.settings.PREDICTION_TTL
+                    )
+                )
             
             return result
             
@@ -380,40 +874,204 @@ class PredictionEngine:
             return await self._generate_demo_prediction(game_id)
 
     async def _predict_win_probability(self, features: np.ndarray) -> Tuple[float, float]:
-        """Predict win probability using ensemble"""
+        """Predict win probability using ensemble
+
+        LightGBM carries half the ensemble weight, so it runs first and
+        confident calls skip the forest and logistic legs entirely; only
+        near-boundary inputs pay for the full ensemble. The native model
+        calls release the GIL and run on worker threads to keep the
+        event loop free. The logistic leg is a single dot product and
+        stays inline with the combine step — dispatching a thread for it
+        would cost more than the math.
+        """
+        if not self.is_trained:
+            return await asyncio.to_thread(self._predict_win_probability_sync, features)
+
+        if self._inbox is not None:
+            future = asyncio.get_running_loop().create_future()
+            await self._inbox.put((features, future))
+            return await future
+
+        try:
+            lgb_pred = await asyncio.to_thread(self._lgb_predict_one, features)
+            early = self._check_early_exit(lgb_pred)
+            if early is not None:
+                return early
+            rf_pred = await asyncio.to_thread(self._rf_predict_one, features)
+            return self._combine_one(features, lgb_pred, rf_pred)
+        except Exception as e:
+            logger.error(f"Win probability prediction failed: {e}")
+            return 0.5, 0.5
+
+    def _check_early_exit(self, lgb_pred: float) -> Optional[Tuple[float, float]]:
+        """Return the LightGBM-only result when it is high-confidence"""
+        self._predict_count += 1
+        if abs(lgb_pred - 0.5) <= self._early_exit_tau:
+            return None
+        self._early_exit_count += 1
+        if self._predict_count % 500 == 0:
+            logger.debug(
+                f"Ensemble early-exit rate: "
+                f"{self._early_exit_count / self._predict_count:.2%}"
+            )
+        return float(lgb_pred), 0.9
+
+    def _lgb_predict_one(self, features: np.ndarray) -> float:
+        """Single-row LightGBM probability via the fastest available path"""
+        if self._compiled_lgbm is not None:
+            return float(self._compiled_lgbm.predict(features.reshape(1, -1))[0])
+        if self._fast_lgbm is not None:
+            return self._fast_lgbm.predict_one(features)
+        if self._shared_booster is not None:
+            # Raw-score predict with early stopping: once the running
+            # tree-sum clears the margin the remaining trees are skipped,
+            # and the sigmoid is applied inline
+            raw = self._shared_booster.predict(
+                features.reshape(1, -1),
+                raw_score=True,
+                pred_early_stop=True,
+                pred_early_stop_freq=10,
+                pred_early_stop_margin=5.0
+            )[0]
+            return sigmoid_scalar(raw)
+        return float(self.lightgbm_model.predict_proba(features.reshape(1, -1))[0, 1])
+
+    def _rf_predict_one(self, features: np.ndarray) -> float:
+        """Single-row random-forest probability"""
+        if self._rf_leaf_values is not None:
+            return float(self._rf_predict_proba_fast(features.reshape(1, -1))[0])
+        return float(self.random_forest_model.predict_proba(features.reshape(1, -1))[0, 1])
+
+    def _combine_one(self, features: np.ndarray, lgb_pred: float,
+                     rf_pred: float) -> Tuple[float, float]:
+        """Logistic leg plus weighted combine and agreement confidence"""
+        if HAS_NUMBA and self._lr_coef is not None and self._mean is not None:
+            # Jitted kernel: scaling, logistic leg, weighted combine,
+            # and agreement std in one compiled pass
+            ensemble_prob, prob_std = _combine(
+                np.ascontiguousarray(features, dtype=np.float32),
+                self._mean, self._inv,
+                self._lr_coef, self._lr_intercept, self._lr_a, self._lr_b,
+                lgb_pred, rf_pred, self._weight_vec
+            )
+            confidence = max(0.5, 1.0 - 2.0 * float(prob_std))
+            return float(ensemble_prob), confidence
+
+        features_scaled = self._scale_features(features.reshape(1, -1))
+        if self._lr_coef is not None:
+            lr_pred = float(self._lr_fast(features_scaled)[0])
+        else:
+            lr_pred = self.logistic_model.predict_proba(features_scaled)[0, 1]
+
+        # Ensemble prediction and agreement-based confidence in one
+        # NumPy pass (no per-call dict lookups)
+        probs = np.array([lgb_pred, lr_pred, rf_pred])
+        ensemble_prob = float(self._weight_vec @ probs)
+        confidence = max(0.5, 1.0 - 2.0 * float(probs.std()))
+
+        return ensemble_prob, confidence
+
+    def _predict_win_probability_sync(self, features: np.ndarray) -> Tuple[float, float]:
+        """Blocking ensemble win-probability prediction"""
         try:
             if not self.is_trained:
                 # Return random but realistic prediction for demo
                 prob = np.random.uniform(0.3, 0.7)
                 confidence = np.random.uniform(0.6, 0.8)
                 return float(prob), float(confidence)
-            
-            # Prepare features
-            features_scaled = self.scaler.transform(features.reshape(1, -1))
-            
-            # Get predictions from each model
-            lgb_pred = self.lightgbm_model.predict_proba(features.reshape(1, -1))[0, 1]
-            lr_pred = self.logistic_model.predict_proba(features_scaled)[0, 1]
-            rf_pred = self.random_forest_model.predict_proba(features.reshape(1, -1))[0, 1]
-            
-            # Ensemble prediction
-            ensemble_prob = (
-                self.ensemble_weights['lightgbm'] * lgb_pred +
-                self.ensemble_weights['logistic'] * lr_pred +
-                self.ensemble_weights['random_forest'] * rf_pred
-            )
-            
-            # Calculate confidence based on model agreement
-            predictions = [lgb_pred, lr_pred, rf_pred]
-            std_dev = np.std(predictions)
-            confidence = max(0.5, 1.0 - (std_dev * 2))  # Higher agreement = higher confidence
-            
-            return float(ensemble_prob), float(confidence)
-            
+
+            lgb_pred = self._lgb_predict_one(features)
+            early = self._check_early_exit(lgb_pred)
+            if early is not None:
+                return early
+            rf_pred = self._rf_predict_one(features)
+            return self._combine_one(features, lgb_pred, rf_pred)
+
         except Exception as e:
             logger.error(f"Win probability prediction failed: {e}")
             return 0.5, 0.5
 
+    def _predict_win_probability_batch(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized ensemble win probability over an (N, F) matrix
+
+        Each model runs exactly once on the full matrix, amortizing the
+        per-invocation overhead (thread fanout, output allocation) that
+        dominates N separate single-row calls.
+        """
+        if not self.is_trained:
+            probs = np.random.uniform(0.3, 0.7, size=len(X))
+            confidence = np.random.uniform(0.6, 0.8, size=len(X))
+            return probs, confidence
+
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        X_scaled = self._scale_features(X)
+
+        if self._compiled_lgbm is not None:
+            lgb_p = np.asarray(self._compiled_lgbm.predict(X))
+        elif self._shared_booster is not None:
+            # Early-stopped raw-score predict; sigmoid applied once over
+            # the whole batch
+            lgb_p = sigmoid(self._shared_booster.predict(
+                X,
+                raw_score=True,
+                pred_early_stop=True,
+                pred_early_stop_freq=10,
+                pred_early_stop_margin=5.0
+            ))
+        else:
+            lgb_p = self.lightgbm_model.predict_proba(X)[:, 1]
+        if self._lr_coef is not None:
+            lr_p = self._lr_fast(X_scaled)
+        else:
+            lr_p = self.logistic_model.predict_proba(X_scaled)[:, 1]
+        if self._rf_leaf_values is not None:
+            rf_p = self._rf_predict_proba_fast(X)
+        else:
+            rf_p = self.random_forest_model.predict_proba(X)[:, 1]
+
+        probs = np.stack([lgb_p, lr_p, rf_p], axis=1)
+        ensemble = probs @ self._weight_vec
+        confidence = np.maximum(0.5, 1.0 - 2.0 * probs.std(axis=1))
+        return ensemble, confidence
+
+    async def _batch_worker(self):
+        """Drain queued single-row predictions into one matrix call
+
+        Waits for the first request, then collects more for up to
+        COALESCE_MAX_WAIT_MS or until COALESCE_MAX_BATCH rows are
+        pending, and runs the batch helper once — amortizing the
+        per-call model overhead across every queued row.
+        """
+        max_batch = self.settings.COALESCE_MAX_BATCH
+        max_wait = self.settings.COALESCE_MAX_WAIT_MS / 1000.0
+
+        while True:
+            items = [await self._inbox.get()]
+            deadline = time.monotonic() + max_wait
+            while len(items) < max_batch:
+                try:
+                    items.append(self._inbox.get_nowait())
+                except asyncio.QueueEmpty:
+                    if time.monotonic() >= deadline:
+                        break
+                    await asyncio.sleep(0.0005)
+
+            X = np.stack([features for features, _ in items])
+            try:
+                probs, confidences = await asyncio.to_thread(
+                    self._predict_win_probability_batch, X
+                )
+                results = [
+                    (float(p), float(c)) for p, c in zip(probs, confidences)
+                ]
+            except Exception as e:
+                logger.error(f"Micro-batch prediction failed: {e}")
+                results = [(0.5, 0.5)] * len(items)
+
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
     async def _predict_spread(self, features: np.ndarray) -> Dict[str, float]:
         """Predict point spread"""
         # Simplified spread prediction based on win probability
@@ -445,13 +1103,14 @@ class PredictionEngine:
         """Generate prediction explanation"""
         try:
             # Get feature importance
-            feature_importance = self._get_feature_importance()
-            
+            self._get_feature_importance()
+            scores = self._feature_importance_table.importances
+
             # Generate explanation based on top features
             main_factors = [
-                f"Team strength differential: {feature_importance[0]['importance']:.2f}",
-                f"Recent form: {feature_importance[1]['importance']:.2f}",
-                f"Home court advantage: {feature_importance[2]['importance']:.2f}"
+                f"Team strength differential: {scores[0]:.2f}",
+                f"Recent form: {scores[1]:.2f}",
+                f"Home court advantage: {scores[2]:.2f}"
             ]
             
             return PredictionExplanation(
@@ -492,7 +1151,7 @@ class PredictionEngine:
             confidence_reasoning="Demo prediction with mock confidence"
         )
         
-        return PredictionResult(
+        return PredictionResult.build_trusted(
             game_id=game_id,
             predictions=predictions,
             explanation=explanation,
@@ -505,19 +1164,186 @@ class PredictionEngine:
             created_at=datetime.utcnow()
         )
 
-    async def predict_batch(self, requests: List) -> List[PredictionResult]:
-        """Generate predictions for multiple games"""
-        tasks = [
-            self.predict(
-                game_id=req.game_id,
-                features=req.features,
-                prediction_types=req.prediction_types,
-                include_explanation=req.include_explanation
+    async def predict_batch(
+        self,
+        requests: List,
+        max_concurrent: Optional[int] = None
+    ) -> List[PredictionResult]:
+        """Generate predictions for multiple games
+
+        Requests are grouped by their prediction_types tuple; each group
+        with features supplied and no explanation runs as one vectorized
+        call per model, and the leftovers (missing features or
+        explanations requested) fall back to bounded per-request tasks.
+        Concurrency on the fallback path is bounded by a semaphore so a
+        single large batch can't saturate Redis connections or starve
+        other requests.
+        """
+        results: List[Optional[PredictionResult]] = [None] * len(requests)
+
+        groups: Dict[Tuple[PredictionType, ...], List[int]] = defaultdict(list)
+        fallback: List[int] = []
+        for index, req in enumerate(requests):
+            if req.features is not None and not req.include_explanation:
+                types = tuple(req.prediction_types or [PredictionType.WIN_PROBABILITY])
+                groups[types].append(index)
+            else:
+                fallback.append(index)
+
+        for types, indices in groups.items():
+            group_results = await self._predict_batch_vectorized(
+                [requests[i] for i in indices], list(types)
             )
-            for req in requests
+            for index, result in zip(indices, group_results):
+                results[index] = result
+
+        if fallback:
+            limit = max_concurrent or self.settings.BATCH_CONCURRENCY
+            semaphore = asyncio.Semaphore(limit)
+
+            async def _bounded_predict(index: int, req):
+                async with semaphore:
+                    results[index] = await self.predict(
+                        game_id=req.game_id,
+                        features=req.features,
+                        prediction_types=req.prediction_types,
+                        include_explanation=req.include_explanation
+                    )
+
+            async with asyncio.TaskGroup() as tg:
+                for index in fallback:
+                    tg.create_task(_bounded_predict(index, requests[index]))
+
+        return results
+
+    async def _predict_batch_vectorized(
+        self,
+        requests: List,
+        prediction_types: List[PredictionType]
+    ) -> List[PredictionResult]:
+        """One matrix call per model for a same-types batch
+
+        Every supported prediction type derives from the win-probability
+        ensemble, so a single batched ensemble pass covers the whole
+        group regardless of which types it asked for. Cache traffic is
+        batched too: one MGET for the group, the model runs only on the
+        misses, and one pipelined MSET writes the fresh results back.
+        """
+        # SoA transpose into one contiguous float32 matrix, then the
+        # fused assembly kernel runs over it in place
+        batch = ModelFeaturesBatch.from_requests(requests)
+        X = self.feature_builder.build_from_batch(batch)
+
+        keys = [
+            f"prediction:{req.game_id}:{xxhash.xxh3_64_intdigest(row.tobytes())}"
+            for req, row in zip(requests, X)
         ]
-        
-        return await asyncio.gather(*tasks, return_exceptions=True)
+        results: List[Optional[PredictionResult]] = [None] * len(requests)
+        misses = list(range(len(requests)))
+        if self.cache_manager:
+            cached = await self.cache_manager.mget(keys)
+            misses = []
+            for index, entry in enumerate(cached):
+                if entry is not None:
+                    result = _result_from_cache(entry)
+                    if result is not None:
+                        results[index] = result
+                        continue
+                misses.append(index)
+
+        if misses:
+            probs, confidences = await asyncio.to_thread(
+                self._predict_win_probability_batch, X[misses]
+            )
+            fresh = self._build_group_results(
+                [requests[i] for i in misses], probs, confidences, prediction_types
+            )
+            for index, result in zip(misses, fresh):
+                results[index] = result
+            if self.cache_manager:
+                await self.cache_manager.mset(
+                    {keys[i]: _result_to_cache(results[i]) for i in misses},
+                    ttl=self.settings.PREDICTION_TTL
+                )
+        return results
+
+    def _build_group_results(
+        self,
+        requests: List,
+        probs: np.ndarray,
+        confidences: np.ndarray,
+        prediction_types: List[PredictionType]
+    ) -> List[PredictionResult]:
+        """Construct PredictionResults for a vectorized group"""
+        created_at = datetime.utcnow()
+        model_info = {
+            'version': self.model_version,
+            'last_trained': self.last_trained.isoformat() if self.last_trained else None,
+            'ensemble_weights': self.ensemble_weights
+        }
+
+        results = []
+        for req, prob, conf in zip(requests, probs, confidences):
+            prob, conf = float(prob), float(conf)
+            predictions = {}
+            for pred_type in prediction_types:
+                if pred_type == PredictionType.WIN_PROBABILITY:
+                    predictions[pred_type] = {
+                        'probability': prob,
+                        'confidence': conf
+                    }
+                elif pred_type == PredictionType.SPREAD:
+                    predictions[pred_type] = {
+                        'spread': (prob - 0.5) * 20,
+                        'confidence': conf
+                    }
+                elif pred_type == PredictionType.TOTAL_POINTS:
+                    predictions[pred_type] = {
+                        'total': float(np.random.uniform(200, 240)),
+                        'confidence': float(np.random.uniform(0.6, 0.8))
+                    }
+            results.append(PredictionResult.build_trusted(
+                game_id=req.game_id,
+                predictions=predictions,
+                explanation=None,
+                model_info=model_info,
+                confidence=predictions.get(
+                    PredictionType.WIN_PROBABILITY, {}
+                ).get('confidence', conf),
+                created_at=created_at
+            ))
+        return results
+
+    async def predict_batch_iter(
+        self,
+        requests: List,
+        max_concurrent: Optional[int] = None
+    ):
+        """Yield predictions one at a time, in request order
+
+        Predictions still run concurrently (bounded by the semaphore);
+        results are yielded as soon as each request's turn completes so
+        callers can stream them without holding the whole batch.
+        """
+        limit = max_concurrent or self.settings.BATCH_CONCURRENCY
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _bounded_predict(req):
+            async with semaphore:
+                return await self.predict(
+                    game_id=req.game_id,
+                    features=req.features,
+                    prediction_types=req.prediction_types,
+                    include_explanation=req.include_explanation
+                )
+
+        tasks = [asyncio.create_task(_bounded_predict(req)) for req in requests]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def get_performance_metrics(self) -> ModelPerformance:
         """Get model performance metrics"""
@@ -551,10 +1377,36 @@ class PredictionEngine:
         """Check if prediction engine is healthy"""
         return True  # Basic health check
 
-    async def retrain_model(self):
-        """Retrain models with new data"""
-        logger.info("Starting model retraining...")
-        # Implementation would fetch new data and retrain
-        # For now, just update the timestamp
-        self.last_trained = datetime.utcnow()
-        logger.info("Model retraining complete")
\ No newline at end of file
+    async def reload_models(self):
+        """Reload model artifacts written by a retraining process"""
+        self.is_trained = False
+        # Drop handles to the pre-retrain booster: _load_models only
+        # reads the booster file when no shared booster is set, and the
+        # batch path prefers these over the freshly loaded classifier,
+        # so keeping them would serve the old model after a retrain.
+        self._shared_booster = None
+        self._compiled_lgbm = None
+        await self._load_models()
+        if self.settings.USE_LLEAVES or self.settings.USE_TREELITE:
+            self._compile_booster()
+        self._init_fast_predict()
+
+
+def retrain_models(model_path: str):
+    """Retrain the ensemble; runs synchronously in a worker process
+
+    Training is CPU-bound, so it must not share a process with the
+    serving event loop. Artifacts are trained into a staging directory
+    and atomically renamed into place so live workers never read a
+    half-written file.
+    """
+    staging = Path(model_path) / 'staging'
+    staging.mkdir(parents=True, exist_ok=True)
+
+    engine = PredictionEngine(model_path=str(staging))
+    asyncio.run(engine._train_initial_models())
+
+    for artifact in staging.iterdir():
+        os.replace(artifact, Path(model_path) / artifact.name)
+    staging.rmdir()
+    logger.info(f"Retrained models written to {model_path}")
\ No newline at end of file
@@ -0,0 +1 @@
+"""API and internal data schemas"""
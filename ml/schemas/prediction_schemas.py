@@ -2,27 +2,75 @@
 Pydantic schemas for ML service API
 """
 
+# Deferred annotation evaluation: class bodies store annotation strings
+# instead of evaluating every Annotated[...]/Dict[...] expression at
+# import. pydantic and attrs resolve them lazily against this module's
+# namespace, which is why the typing/datetime imports below must stay
+# runtime imports rather than move under TYPE_CHECKING.
+from __future__ import annotations
+
+import sys
+import time
+
+import attrs
+import numpy as np
+import orjson
+
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Any, Union
-from pydantic import BaseModel, Field
+from typing import Annotated, Dict, List, Optional, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, computed_field, model_validator
+from typing_extensions import TypedDict
+
+# Shared config for hot-path models: skip the extra-field bookkeeping
+# and assignment validators so construction stays inside pydantic-core's
+# compiled fast path
+_HOT_MODEL_CONFIG = ConfigDict(extra='ignore', validate_assignment=False)
+
+# Response models are read-only after construction: frozen skips the
+# __setattr__ validator path and lets instances be hashed/cached safely
+_RESPONSE_MODEL_CONFIG = ConfigDict(
+    extra='forbid', validate_assignment=False, frozen=True
+)
 
 # Enums
-class PredictionType(str, Enum):
+class _InternedStrEnum(str, Enum):
+    """str Enum with interned values and a cached hash
+
+    These members key the predictions dict on every response build;
+    interning makes equality a pointer compare first, and caching the
+    hash avoids rehashing the string per lookup. Hashing by value (not
+    by member name, Enum's default) also means interchangeable lookups
+    with the raw string form cached entries carry.
+    """
+
+    def __init__(self, value):
+        self._value_ = sys.intern(value)
+        self._cached_hash = hash(self._value_)
+
+    def __hash__(self):
+        return self._cached_hash
+
+class PredictionType(_InternedStrEnum):
     WIN_PROBABILITY = "win_probability"
-    SPREAD = "spread" 
+    SPREAD = "spread"
     TOTAL_POINTS = "total_points"
     PLAYER_PERFORMANCE = "player_performance"
 
-class ModelType(str, Enum):
+class ModelType(_InternedStrEnum):
     LIGHTGBM = "lightgbm"
     LOGISTIC_REGRESSION = "logistic_regression"
     RANDOM_FOREST = "random_forest"
     ENSEMBLE = "ensemble"
 
+# Pre-bound member for hot loops, skipping the Enum attribute lookup
+WIN_PROB = PredictionType.WIN_PROBABILITY
+
 # Feature Models
 class ModelFeatures(BaseModel):
     """Game features for ML prediction"""
+    model_config = _HOT_MODEL_CONFIG
+
     # Team-level features
     home_team_elo: float = Field(..., description="Home team Elo rating")
     away_team_elo: float = Field(..., description="Away team Elo rating")
@@ -36,116 +84,295 @@ class ModelFeatures(BaseModel):
     home_team_rest_days: int = Field(..., description="Days since home team's last game")
     away_team_rest_days: int = Field(..., description="Days since away team's last game")
     
-    # Season context
-    home_team_wins: int = Field(..., description="Home team season wins")
-    home_team_losses: int = Field(..., description="Home team season losses")
-    away_team_wins: int = Field(..., description="Away team season wins")
-    away_team_losses: int = Field(..., description="Away team season losses")
-    
-    # Advanced metrics (optional)
-    home_team_off_rating: Optional[float] = Field(None, description="Home team offensive rating")
-    home_team_def_rating: Optional[float] = Field(None, description="Home team defensive rating")
-    away_team_off_rating: Optional[float] = Field(None, description="Away team offensive rating")
-    away_team_def_rating: Optional[float] = Field(None, description="Away team defensive rating")
-    
-    # Situational
-    is_playoff: bool = Field(False, description="Is playoff game")
-    is_back_to_back: bool = Field(False, description="Is back-to-back game for either team")
-    venue_advantage: float = Field(0.0, description="Home venue advantage factor")
+    # Season context. Clients used to send four win/loss counts that
+    # every consumer immediately reduced to win percentages; the model
+    # now carries the percentages directly (two validator slots instead
+    # of four, no per-request division downstream). Legacy count
+    # payloads are still accepted via _derive_win_pct and will be
+    # rejected in the next major version.
+    home_team_win_pct: float = Field(..., ge=0.0, le=1.0, description="Home team season win percentage")
+    away_team_win_pct: float = Field(..., ge=0.0, le=1.0, description="Away team season win percentage")
     
+    # Advanced metrics (optional). strict=True keeps pydantic-core on its
+    # zero-coercion float path (ints are still accepted) instead of the
+    # lax try-int/try-str/try-None ladder the bare Union compiled to;
+    # the bounds double as boundary sanity checks.
+    home_team_off_rating: Annotated[Optional[float], Field(ge=50.0, le=200.0, strict=True)] = Field(None, description="Home team offensive rating")
+    home_team_def_rating: Annotated[Optional[float], Field(ge=50.0, le=200.0, strict=True)] = Field(None, description="Home team defensive rating")
+    away_team_off_rating: Annotated[Optional[float], Field(ge=50.0, le=200.0, strict=True)] = Field(None, description="Away team offensive rating")
+    away_team_def_rating: Annotated[Optional[float], Field(ge=50.0, le=200.0, strict=True)] = Field(None, description="Away team defensive rating")
+
+    # Situational. Strict bools skip the "true"/1/0 coercion path; the
+    # clients send real JSON booleans.
+    is_playoff: Annotated[bool, Field(strict=True)] = Field(False, description="Is playoff game")
+    is_back_to_back: Annotated[bool, Field(strict=True)] = Field(False, description="Is back-to-back game for either team")
+    venue_advantage: float = Field(0.0, ge=0.0, le=1.0, strict=True, description="Home venue advantage factor")
+
     # Weather (for outdoor sports)
-    temperature: Optional[float] = Field(None, description="Temperature in Fahrenheit")
-    wind_speed: Optional[float] = Field(None, description="Wind speed in mph")
-    precipitation: bool = Field(False, description="Is precipitation expected")
+    temperature: Annotated[Optional[float], Field(ge=-30.0, le=130.0, strict=True)] = Field(None, description="Temperature in Fahrenheit")
+    wind_speed: Annotated[Optional[float], Field(ge=0.0, le=100.0, strict=True)] = Field(None, description="Wind speed in mph")
+    precipitation: Annotated[bool, Field(strict=True)] = Field(False, description="Is precipitation expected")
     
     # Injuries/availability
-    home_team_injury_impact: float = Field(0.0, description="Injury impact factor (0-1)")
-    away_team_injury_impact: float = Field(0.0, description="Injury impact factor (0-1)")
+    home_team_injury_impact: float = Field(0.0, ge=0.0, le=1.0, strict=True, description="Injury impact factor (0-1)")
+    away_team_injury_impact: float = Field(0.0, ge=0.0, le=1.0, strict=True, description="Injury impact factor (0-1)")
+
+    @model_validator(mode='before')
+    @classmethod
+    def _derive_win_pct(cls, data):
+        """Accept deprecated win/loss count payloads during migration"""
+        if isinstance(data, dict):
+            for side in ('home', 'away'):
+                wins = data.pop(f'{side}_team_wins', None)
+                losses = data.pop(f'{side}_team_losses', None)
+                pct_key = f'{side}_team_win_pct'
+                if pct_key not in data and wins is not None and losses is not None:
+                    try:
+                        wins = int(wins)
+                        losses = int(losses)
+                    except (TypeError, ValueError):
+                        # ValueError surfaces as a 422 validation error,
+                        # not a 500, for malformed legacy payloads
+                        raise ValueError(
+                            f"{side}_team_wins/losses must be integers"
+                        )
+                    total = wins + losses
+                    data[pct_key] = wins / total if total else 0.5
+        return data
+
+# Canonical feature order, introspected from ModelFeatures once at
+# import instead of per call. FEATURE_INDEX gives O(1) column lookup and
+# membership checks. The feature-builder kernels hardcode column indices
+# against this order, so field order in ModelFeatures is load-bearing.
+FEATURE_NAMES = tuple(ModelFeatures.model_fields.keys())
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
 
 # Request Models
 class PredictionRequest(BaseModel):
     """Single game prediction request"""
+    model_config = _HOT_MODEL_CONFIG
+
     game_id: str = Field(..., description="Unique game identifier")
     features: Optional[ModelFeatures] = Field(None, description="Game features for prediction")
     prediction_types: List[PredictionType] = Field(
-        default=[PredictionType.WIN_PROBABILITY], 
+        default_factory=lambda: [PredictionType.WIN_PROBABILITY],
         description="Types of predictions to generate"
     )
     include_explanation: bool = Field(True, description="Include prediction explanation")
 
 class BatchPredictionRequest(BaseModel):
     """Batch prediction request"""
+    model_config = _HOT_MODEL_CONFIG
+
     game_requests: List[PredictionRequest] = Field(..., description="List of game prediction requests")
     max_concurrent: int = Field(10, description="Maximum concurrent predictions")
 
+# Pre-compiled validator for the batch ingress path. validate_json parses
+# and validates in one pass inside pydantic-core, skipping the
+# bytes → dict → BaseModel.__init__ round trip.
+_BATCH_REQ_ADAPTER = TypeAdapter(BatchPredictionRequest)
+
+class ModelFeaturesBatch(BaseModel):
+    """Structure-of-arrays view of a batch of game features
+
+    One contiguous (N, F) float32 matrix with a fixed column layout
+    instead of N ModelFeatures objects: downstream inference consumes
+    the buffer zero-copy, booleans are encoded as 0.0/1.0, and missing
+    optional fields as NaN.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: np.ndarray
+    columns: List[str]
+
+    @classmethod
+    def from_requests(cls, requests: List["PredictionRequest"]) -> "ModelFeaturesBatch":
+        """Transpose per-request ModelFeatures into the feature matrix"""
+        columns = list(FEATURE_NAMES)
+        data = np.empty((len(requests), len(columns)), dtype=np.float32)
+        for i, req in enumerate(requests):
+            features = req.features
+            for j, name in enumerate(columns):
+                value = getattr(features, name)
+                data[i, j] = np.nan if value is None else float(value)
+        return cls.model_construct(data=data, columns=columns)
+
 # Response Models
+class PerTypePrediction(TypedDict, total=False):
+    """Per-type prediction payload
+
+    Flat float fields instead of Dict[str, Any]: pydantic-core validates
+    a TypedDict with one compiled check per known key, where the nested
+    Any-dict annotation walked every entry through the enum and Any
+    validators on each response build.
+    """
+    probability: float
+    confidence: float
+    spread: float
+    total: float
+
 class PredictionExplanation(BaseModel):
     """Explanation of prediction reasoning"""
     main_factors: List[str] = Field(..., description="Primary factors influencing prediction")
-    supporting_factors: List[str] = Field(default=[], description="Supporting factors")
-    risk_factors: List[str] = Field(default=[], description="Risk factors that could affect outcome")
+    supporting_factors: List[str] = Field(default_factory=list, description="Supporting factors")
+    risk_factors: List[str] = Field(default_factory=list, description="Risk factors that could affect outcome")
     confidence_reasoning: str = Field(..., description="Explanation of confidence level")
     historical_comparison: Optional[Dict[str, Any]] = Field(None, description="Comparison to similar historical games")
 
 class PredictionResult(BaseModel):
     """Individual prediction result"""
+    model_config = _RESPONSE_MODEL_CONFIG
+
     game_id: str = Field(..., description="Game identifier")
-    predictions: Dict[PredictionType, Dict[str, Any]] = Field(..., description="Prediction results by type")
+    predictions: Dict[PredictionType, PerTypePrediction] = Field(..., description="Prediction results by type")
     explanation: Optional[PredictionExplanation] = Field(None, description="Prediction explanation")
     model_info: Dict[str, Any] = Field(..., description="Model metadata")
-    confidence: float = Field(..., description="Overall prediction confidence (0-1)")
+    confidence: float = Field(..., ge=0.0, le=1.0, strict=True, description="Overall prediction confidence (0-1)")
     created_at: datetime = Field(..., description="Prediction timestamp")
 
-class PredictionResponse(BaseModel):
-    """Single prediction API response"""
-    game_id: str = Field(..., description="Game identifier")
-    predictions: Dict[PredictionType, Dict[str, Any]] = Field(..., description="Prediction results")
-    explanation: Optional[PredictionExplanation] = Field(None, description="Prediction explanation")
-    model_info: Dict[str, Any] = Field(..., description="Model information")
-    confidence: float = Field(..., description="Prediction confidence")
-    created_at: datetime = Field(..., description="Response timestamp")
+    @classmethod
+    def build_trusted(cls, **data) -> "PredictionResult":
+        """Construct without validation from trusted internal data
+
+        The service layer assembles results from model outputs (floats
+        the engine just computed, never user-controlled), so full
+        validation is pure overhead there. API ingress models still go
+        through the stock validating path.
+        """
+        return cls.model_construct(**data)
+
+# The API response was field-for-field identical to PredictionResult;
+# aliasing avoids pydantic-core compiling a second validator/serializer
+# pair for the same shape.
+PredictionResponse = PredictionResult
 
 class BatchPredictionResponse(BaseModel):
     """Batch prediction API response"""
+    model_config = _RESPONSE_MODEL_CONFIG
+
     predictions: List[Union[PredictionResult, Dict[str, str]]] = Field(..., description="Batch prediction results")
     total_games: int = Field(..., description="Total games requested")
     successful_predictions: int = Field(..., description="Number of successful predictions")
     batch_id: str = Field(..., description="Batch identifier")
 
+    @classmethod
+    def build_trusted(cls, **data) -> "BatchPredictionResponse":
+        """Construct without validation (see PredictionResult.build_trusted)"""
+        return cls.model_construct(**data)
+
+    def model_dump_json(self, **kwargs) -> str:
+        """Serialize through orjson for large batches
+
+        pydantic's own JSON writer formats every nested PredictionResult
+        field-by-field; orjson's native number/datetime formatting is
+        several times faster on batch-sized payloads. Callers passing
+        serializer kwargs still get the stock pydantic path.
+        """
+        if kwargs:
+            return super().model_dump_json(**kwargs)
+        return orjson.dumps(
+            self.model_dump(mode='json'),
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+        ).decode()
+
 # Model Performance Models
 class FeatureImportance(BaseModel):
     """Feature importance information"""
+    model_config = _RESPONSE_MODEL_CONFIG
+
     feature: str = Field(..., description="Feature name")
     importance: float = Field(..., description="Importance score")
     rank: int = Field(..., description="Importance rank")
 
-class ModelPerformance(BaseModel):
-    """Model performance metrics"""
-    accuracy: float = Field(..., description="Model accuracy")
-    log_loss: float = Field(..., description="Logarithmic loss")
-    auc_roc: float = Field(..., description="Area under ROC curve")
-    calibration_score: float = Field(..., description="Calibration score (1 - Brier score)")
-    feature_importance: List[FeatureImportance] = Field(default=[], description="Feature importance ranking")
-    last_trained: datetime = Field(..., description="Last training timestamp")
-    training_samples: int = Field(..., description="Number of training samples")
-    model_version: str = Field(..., description="Model version")
+class FeatureImportanceTable(BaseModel):
+    """Columnar feature-importance ranking
+
+    Three parallel arrays instead of a list of per-feature objects:
+    ranking is one NumPy argsort, internal consumers index the columns
+    directly, and the row objects exist only when an API response needs
+    them (to_records).
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    names: List[str]
+    importances: np.ndarray
+    ranks: np.ndarray
+
+    @classmethod
+    def from_scores(cls, names: List[str], scores) -> "FeatureImportanceTable":
+        """Rank raw model scores descending into a table
+
+        Extra scores without a name are dropped (and vice versa), e.g.
+        when importance is read before feature names are populated
+        during training.
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        n = min(len(names), scores.shape[0])
+        scores = scores[:n]
+        order = np.argsort(scores)[::-1]
+        return cls.model_construct(
+            names=[names[i] for i in order],
+            importances=scores[order],
+            ranks=np.arange(1, n + 1),
+        )
+
+    def to_records(self) -> List[FeatureImportance]:
+        """Materialize row objects for the API boundary"""
+        return [
+            FeatureImportance.model_construct(
+                feature=name, importance=float(imp), rank=int(rank)
+            )
+            for name, imp, rank in zip(self.names, self.importances, self.ranks)
+        ]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize plain dict rows (metadata persistence, legacy consumers)"""
+        return [
+            {'feature': name, 'importance': float(imp), 'rank': int(rank)}
+            for name, imp, rank in zip(self.names, self.importances, self.ranks)
+        ]
+
+@attrs.define(slots=True)
+class ModelPerformance:
+    """Model performance metrics
+
+    Engine-internal: constructed from the engine's own evaluation and
+    persisted in the model metadata, never validated at the HTTP
+    boundary, so a slotted attrs class replaces BaseModel — plain
+    attribute stores instead of per-field validator dispatch.
+    """
+    accuracy: float
+    log_loss: float
+    auc_roc: float
+    calibration_score: float
+    last_trained: datetime
+    training_samples: int
+    model_version: str
+    feature_importance: List[Dict[str, Any]] = attrs.field(factory=list)
 
 class ModelPerformanceResponse(BaseModel):
     """Model performance API response"""
-    accuracy: float = Field(..., description="Model accuracy")
+    model_config = _RESPONSE_MODEL_CONFIG
+
+    accuracy: float = Field(..., ge=0.0, le=1.0, strict=True, description="Model accuracy")
     log_loss: float = Field(..., description="Logarithmic loss")
-    auc_roc: float = Field(..., description="Area under ROC curve")
-    calibration_score: float = Field(..., description="Calibration score")
+    auc_roc: float = Field(..., ge=0.0, le=1.0, strict=True, description="Area under ROC curve")
+    calibration_score: float = Field(..., ge=0.0, le=1.0, strict=True, description="Calibration score")
     feature_importance: List[FeatureImportance] = Field(..., description="Feature importance")
     last_trained: datetime = Field(..., description="Last training date")
     training_samples: int = Field(..., description="Training sample count")
     model_version: str = Field(..., description="Model version")
 
-class FeatureInfo(BaseModel):
-    """Feature information"""
-    feature_names: List[str] = Field(..., description="List of feature names")
-    feature_importance: List[FeatureImportance] = Field(..., description="Feature importance scores")
-    feature_descriptions: Dict[str, str] = Field(..., description="Feature descriptions")
+@attrs.define(slots=True)
+class FeatureInfo:
+    """Feature information
+
+    Engine-internal like ModelPerformance; the /model/features handler
+    reads its attributes into a plain response dict.
+    """
+    feature_names: List[str]
+    feature_importance: List[Dict[str, Any]]
+    feature_descriptions: Dict[str, str]
 
 # Health Check Model
 class HealthResponse(BaseModel):
@@ -153,35 +380,53 @@ class HealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
     version: str = Field(..., description="Service version")
     model_version: Optional[str] = Field(None, description="ML model version")
-    services: Dict[str, str] = Field(default={}, description="Dependent service status")
+    services: Dict[str, str] = Field(default_factory=dict, description="Dependent service status")
     error: Optional[str] = Field(None, description="Error message if unhealthy")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Health check timestamp")
+    # Stored as an int so construction on the health-check hot path is a
+    # single store; the datetime form is derived only when serialized
+    timestamp_ns: int = Field(default_factory=time.time_ns, description="Health check timestamp (ns since epoch)")
+
+    @computed_field(description="Health check timestamp")  # type: ignore[misc]
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.utcfromtimestamp(self.timestamp_ns / 1e9)
 
 # Training Models
 class TrainingRequest(BaseModel):
     """Model training request"""
     data_source: str = Field(..., description="Training data source")
-    model_types: List[ModelType] = Field(default=[ModelType.ENSEMBLE], description="Models to train")
+    model_types: List[ModelType] = Field(default_factory=lambda: [ModelType.ENSEMBLE], description="Models to train")
     hyperparameter_tuning: bool = Field(False, description="Enable hyperparameter tuning")
-    validation_split: float = Field(0.2, description="Validation data split ratio")
+    validation_split: float = Field(0.2, ge=0.0, le=1.0, strict=True, description="Validation data split ratio")
     force_retrain: bool = Field(False, description="Force retrain even if recent model exists")
 
-class TrainingStatus(BaseModel):
-    """Training status response"""
-    status: str = Field(..., description="Training status")
-    progress: float = Field(..., description="Training progress (0-1)")
-    current_model: Optional[str] = Field(None, description="Currently training model")
-    estimated_completion: Optional[datetime] = Field(None, description="Estimated completion time")
-    error: Optional[str] = Field(None, description="Error message if failed")
+@attrs.define(slots=True, frozen=True)
+class TrainingStatus:
+    """Training status snapshot
+
+    Never validated at the HTTP boundary (the retrain endpoints return
+    plain dicts), so a frozen slotted attrs class like the other
+    engine-internal records.
+    """
+    status: str
+    progress: float
+    current_model: Optional[str] = None
+    estimated_completion: Optional[datetime] = None
+    error: Optional[str] = None
 
 # Cache Models
-class CacheStats(BaseModel):
-    """Cache statistics"""
-    total_keys: int = Field(..., description="Total cached keys")
-    hit_rate: float = Field(..., description="Cache hit rate")
-    memory_usage: str = Field(..., description="Memory usage")
-    prediction_cache_size: int = Field(..., description="Number of cached predictions")
-    last_cleared: Optional[datetime] = Field(None, description="Last cache clear timestamp")
+@attrs.define(slots=True, frozen=True)
+class CacheStats:
+    """Cache statistics snapshot
+
+    Internal like TrainingStatus; /cache/stats serves the cache
+    manager's raw counter dict directly.
+    """
+    total_keys: int
+    hit_rate: float
+    memory_usage: str
+    prediction_cache_size: int
+    last_cleared: Optional[datetime] = None
 
 # Error Models
 class MLServiceError(BaseModel):
@@ -189,4 +434,9 @@ class MLServiceError(BaseModel):
     error_code: str = Field(..., description="Error code")
     message: str = Field(..., description="Error message")
     details: Optional[Dict[str, Any]] = Field(None, description="Error details")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
\ No newline at end of file
+    timestamp_ns: int = Field(default_factory=time.time_ns, description="Error timestamp (ns since epoch)")
+
+    @computed_field(description="Error timestamp")  # type: ignore[misc]
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.utcfromtimestamp(self.timestamp_ns / 1e9)
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Build script for the optional compiled extensions
+
+    python setup.py build_ext --inplace
+
+The service runs fine without the extensions; utils/fastmath.py falls
+back to NumPy implementations when _fast is not importable.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="nova-titan-ml-ext",
+    # Only the numeric kernels are compiled. The schemas module must stay
+    # pure Python: pydantic treats Cython-compiled methods as unannotated
+    # class attributes and refuses to build the models.
+    ext_modules=cythonize(
+        ["_fast.pyx"],
+        compiler_directives={"language_level": "3", "boundscheck": False}
+    ),
+)
@@ -0,0 +1 @@
+"""Cache, config, coalescing, and numeric helpers"""
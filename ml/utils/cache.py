@@ -0,0 +1,205 @@
+"""
+Nova Titan Cache Manager
+Redis-backed prediction cache with pooled connections
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import orjson
+import redis.asyncio as redis
+from loguru import logger
+
+from .config import get_settings
+
+# /health must never hang on a slow Redis; ping is bounded to this
+_PING_TIMEOUT = 0.05
+
+
+class CacheManager:
+    """Async Redis cache with a shared connection pool
+
+    All calls go through one connection pool so concurrent predictions
+    reuse sockets instead of paying a TCP handshake; reads can opt into
+    a sliding-TTL EXPIRE pipelined with the GET in a single round-trip.
+    Values are serialized with orjson. Failures degrade to cache-off
+    behavior; the service keeps serving predictions without Redis.
+    """
+
+    def __init__(self, redis_url: str):
+        self.redis_url = redis_url
+        self.settings = get_settings()
+        self.prefix = self.settings.REDIS_PREFIX
+        self._pool: Optional[redis.ConnectionPool] = None
+        self._redis: Optional[redis.Redis] = None
+        self._hits = 0
+        self._misses = 0
+
+    async def initialize(self):
+        """Create the connection pool and verify connectivity"""
+        if not self.settings.ENABLE_CACHE:
+            logger.warning("Caching disabled via ENABLE_CACHE")
+            return
+
+        self._pool = redis.ConnectionPool.from_url(
+            self.redis_url,
+            max_connections=256,
+            decode_responses=False
+        )
+        self._redis = redis.Redis(connection_pool=self._pool)
+
+        try:
+            await self._redis.ping()
+            logger.info("Redis connection pool ready")
+        except Exception as e:
+            logger.warning(f"Redis unavailable, running without cache: {e}")
+            self._redis = None
+
+    async def close(self):
+        """Close the Redis connections"""
+        if self._redis:
+            await self._redis.close()
+        if self._pool:
+            await self._pool.disconnect()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key: str, refresh_ttl: Optional[int] = None) -> Optional[Any]:
+        """Get a cached value, optionally sliding its TTL in the same
+        round-trip
+
+        refresh_ttl is opt-in: prediction entries carry a deliberately
+        short PREDICTION_TTL freshness bound, and an unconditional
+        refresh on every hit would extend hot games' entries forever.
+        """
+        if self._redis is None:
+            return None
+        try:
+            full_key = self._key(key)
+            if refresh_ttl:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.get(full_key)
+                    pipe.expire(full_key, refresh_ttl)
+                    value, _ = await pipe.execute()
+            else:
+                value = await self._redis.get(full_key)
+
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return orjson.loads(value)
+        except Exception as e:
+            logger.warning(f"Cache get failed: {e}")
+            return None
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get many cached values in one round-trip, in key order
+
+        A batch of N sequential gets pays N Redis RTTs; MGET pays one.
+        """
+        if self._redis is None or not keys:
+            return [None] * len(keys)
+        try:
+            values = await self._redis.mget([self._key(k) for k in keys])
+            results = []
+            for value in values:
+                if value is None:
+                    self._misses += 1
+                    results.append(None)
+                else:
+                    self._hits += 1
+                    results.append(orjson.loads(value))
+            return results
+        except Exception as e:
+            logger.warning(f"Cache mget failed: {e}")
+            return [None] * len(keys)
+
+    async def mset(self, items: Dict[str, Any], ttl: Optional[int] = None):
+        """Cache many values in one pipelined round-trip
+
+        Plain MSET can't carry TTLs, so this pipelines one SET per key
+        instead — still a single round-trip.
+        """
+        if self._redis is None or not items:
+            return
+        try:
+            expire = ttl or self.settings.CACHE_TTL
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    payload = orjson.dumps(
+                        value,
+                        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                    )
+                    pipe.set(self._key(key), payload, ex=expire)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache mset failed: {e}")
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Cache a value with a TTL (defaults to CACHE_TTL)"""
+        if self._redis is None:
+            return
+        try:
+            payload = orjson.dumps(
+                value,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+            await self._redis.set(
+                self._key(key), payload, ex=ttl or self.settings.CACHE_TTL
+            )
+        except Exception as e:
+            logger.warning(f"Cache set failed: {e}")
+
+    async def is_healthy(self) -> bool:
+        """Bounded Redis ping so health checks never hang"""
+        if self._redis is None:
+            return False
+        try:
+            await asyncio.wait_for(self._redis.ping(), timeout=_PING_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total_requests = self._hits + self._misses
+        stats = {
+            "total_keys": 0,
+            "hit_rate": self._hits / total_requests if total_requests else 0.0,
+            "memory_usage": "unknown",
+            "prediction_cache_size": 0
+        }
+        if self._redis is None:
+            return stats
+        try:
+            stats["total_keys"] = await self._redis.dbsize()
+            info = await self._redis.info("memory")
+            stats["memory_usage"] = info.get("used_memory_human", "unknown")
+
+            count = 0
+            async for _ in self._redis.scan_iter(match=f"{self.prefix}:pred*", count=500):
+                count += 1
+            stats["prediction_cache_size"] = count
+        except Exception as e:
+            logger.warning(f"Cache stats failed: {e}")
+        return stats
+
+    async def clear_predictions(self) -> int:
+        """Delete all cached predictions; returns the number removed"""
+        if self._redis is None:
+            return 0
+        cleared = 0
+        try:
+            batch = []
+            async for key in self._redis.scan_iter(match=f"{self.prefix}:pred*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    cleared += await self._redis.unlink(*batch)
+                    batch = []
+            if batch:
+                cleared += await self._redis.unlink(*batch)
+        except Exception as e:
+            logger.warning(f"Cache clear failed: {e}")
+        return cleared
@@ -0,0 +1,73 @@
+"""
+Nova Titan ML Service Configuration
+Environment-driven settings shared across the service
+"""
+
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+
+# Load .env for local development; in Docker the env is injected directly
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    """Service configuration loaded from environment variables"""
+
+    def __init__(self):
+        # Environment
+        self.ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+        # Model configuration
+        self.MODEL_PATH = os.getenv("MODEL_PATH", "/app/models")
+        self.DATA_PATH = os.getenv("DATA_PATH", "/app/data")
+        self.MODEL_VERSION = os.getenv("MODEL_VERSION", "1.0.0")
+        self.AUTO_RETRAIN = _env_bool("AUTO_RETRAIN", False)
+        # Load the booster at import time so gunicorn --preload shares it
+        # across forked workers via copy-on-write
+        self.PRELOAD_MODEL = _env_bool("PRELOAD_MODEL", False)
+        # Compile the LightGBM booster to native code with lleaves
+        # (optional dependency); validate accuracy drift before enabling
+        self.USE_LLEAVES = _env_bool("USE_LLEAVES", False)
+        # Treelite codegen fallback when lleaves isn't available
+        self.USE_TREELITE = _env_bool("USE_TREELITE", False)
+
+        # Performance settings
+        self.MAX_WORKERS = int(os.getenv("MAX_WORKERS", "4"))
+        self.BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))
+        self.PREDICTION_TIMEOUT = int(os.getenv("PREDICTION_TIMEOUT", "30"))
+        self.CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
+        # Short TTL for the API-layer prediction cache (live odds refresh
+        # bursts reuse identical feature sets within seconds)
+        self.PREDICTION_TTL = int(os.getenv("PREDICTION_TTL", "300"))
+        # Upper bound on concurrent per-game predictions within one batch
+        self.BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "10"))
+        # Pin each worker process to one CPU core so the booster's hot
+        # data stays in the same L2 cache (gunicorn deploys only)
+        self.PIN_WORKERS = _env_bool("PIN_WORKERS", False)
+        # Run warmup predictions at startup (disable for faster dev boot)
+        self.WARMUP = _env_bool("WARMUP", True)
+        # Micro-batch coalescing of concurrent single predictions
+        self.ENABLE_COALESCING = _env_bool("ENABLE_COALESCING", True)
+        self.COALESCE_MAX_BATCH = int(os.getenv("COALESCE_MAX_BATCH", "32"))
+        self.COALESCE_MAX_WAIT_MS = float(os.getenv("COALESCE_MAX_WAIT_MS", "5"))
+        # Engine-level micro-batching of win-probability calls; off by
+        # default because the API layer already coalesces requests, but
+        # useful for deployments driving the engine directly
+        self.ENGINE_MICRO_BATCH = _env_bool("ENGINE_MICRO_BATCH", False)
+
+        # Redis cache
+        self.REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.REDIS_PREFIX = os.getenv("REDIS_PREFIX", "nova_titan_ml")
+        self.ENABLE_CACHE = _env_bool("ENABLE_CACHE", True)
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    """Get the cached settings instance"""
+    return Settings()
@@ -0,0 +1,23 @@
+"""
+Nova Titan Fast Math
+Numeric kernels backed by the compiled _fast extension when built,
+with NumPy fallbacks otherwise
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from .._fast import sigmoid, sigmoid_scalar
+    HAS_COMPILED = True
+except ImportError:  # pragma: no cover - depends on build environment
+    HAS_COMPILED = False
+
+    def sigmoid(x):
+        """Elementwise logistic sigmoid (NumPy fallback)"""
+        return 1.0 / (1.0 + np.exp(-np.asarray(x, dtype=np.float64)))
+
+    def sigmoid_scalar(x):
+        """Logistic sigmoid of a single value (math fallback)"""
+        return 1.0 / (1.0 + math.exp(-x))